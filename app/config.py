@@ -17,6 +17,38 @@ class Config:
     # Model settings
     MODEL_NAME = os.getenv('MODEL_NAME', 'anthropic.claude-3-haiku-20240307-v1:0')
 
+    # Model tiers (see app.services.model_router). MODEL_NAME/MAX_TOKENS is the standard tier.
+    FAST_MODEL_NAME = os.getenv('FAST_MODEL_NAME', MODEL_NAME)
+    FAST_MAX_TOKENS = int(os.getenv('FAST_MAX_TOKENS', '4096'))
+    FAST_TIER_MAX_INPUT_TOKENS = int(os.getenv('FAST_TIER_MAX_INPUT_TOKENS', '12000'))
+    LARGE_MODEL_NAME = os.getenv('LARGE_MODEL_NAME', MODEL_NAME)
+    LARGE_MAX_TOKENS = int(os.getenv('LARGE_MAX_TOKENS', str(MAX_TOKENS)))
+    LARGE_TIER_MIN_INPUT_TOKENS = int(os.getenv('LARGE_TIER_MIN_INPUT_TOKENS', '60000'))
+    FORMAT_CHECK_MODEL_NAME = os.getenv('FORMAT_CHECK_MODEL_NAME', FAST_MODEL_NAME)
+    FORMAT_CHECK_MAX_TOKENS = int(os.getenv('FORMAT_CHECK_MAX_TOKENS', '6000'))
+
+    # Paper sections left out of the summarization prompt (see app.services.extract_sections)
+    PROMPT_EXCLUDED_SECTIONS = [
+        name.strip() for name in os.getenv('PROMPT_EXCLUDED_SECTIONS', 'references,appendix,acknowledgments').split(',')
+        if name.strip()
+    ]
+
+    # Near-duplicate detection (see app.services.near_duplicates)
+    DEDUP_NUM_PERM = int(os.getenv('DEDUP_NUM_PERM', '128'))
+    DEDUP_BANDS = int(os.getenv('DEDUP_BANDS', '16'))
+    DEDUP_SHINGLE_SIZE = int(os.getenv('DEDUP_SHINGLE_SIZE', '5'))
+    DEDUP_SIMILARITY_THRESHOLD = float(os.getenv('DEDUP_SIMILARITY_THRESHOLD', '0.8'))
+    # Texts with fewer shingles (failed or scanned extractions) are never checked or indexed
+    DEDUP_MIN_SHINGLES = int(os.getenv('DEDUP_MIN_SHINGLES', '50'))
+    # skip: record near-duplicates as handled without a deck, link: record them pointing at the existing deck
+    DEDUP_ACTION = os.getenv('DEDUP_ACTION', 'link')
+
+    # Batch budgets (see app.services.batch_scheduler); 0 means unlimited
+    BATCH_TOKEN_BUDGET = int(os.getenv('BATCH_TOKEN_BUDGET', '0'))
+    BATCH_TIME_BUDGET_SECONDS = float(os.getenv('BATCH_TIME_BUDGET_SECONDS', '0'))
+    # Fallback cost estimate until llm_usages has history
+    ESTIMATED_TOKENS_PER_PDF_BYTE = float(os.getenv('ESTIMATED_TOKENS_PER_PDF_BYTE', '0.02'))
+
     # AWS settings
     AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
     AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
@@ -28,10 +60,60 @@ class Config:
     CSS_TEMPLATE_PATH = os.getenv('CSS_TEMPLATE_PATH', 'marp_themes/custom.css')
     OUTPUT_DIR = os.getenv('OUTPUT_DIR', 'temp')
 
+    # Bulk re-render settings (see app.services.rebuild_decks)
+    REBUILD_BATCH_SIZE = int(os.getenv('REBUILD_BATCH_SIZE', '50'))
+    REBUILD_WORKERS = int(os.getenv('REBUILD_WORKERS', '4'))
+    REBUILD_CHECKPOINT_PATH = os.getenv('REBUILD_CHECKPOINT_PATH', os.path.join(OUTPUT_DIR, 'rebuild_checkpoint.json'))
+
     # S3 settings
     S3_BUCKET_NAME = 'marp-presentation'
     S3_DOWNLOAD_FOLDER_DIR = 'raw_files'
     S3_UPLOAD_FOLDER_DIR = 'paper'
+    S3_ASSET_FOLDER_DIR = 'assets'
+
+    # Slide HTML delivery (see app.services.html_optimizer)
+    SLIDE_HTML_OPTIMIZE = os.getenv('SLIDE_HTML_OPTIMIZE', 'true').lower() == 'true'
+    # Also store "<key>.br" brotli copies. Only enable once an edge function serves them.
+    SLIDE_HTML_BROTLI = os.getenv('SLIDE_HTML_BROTLI', 'false').lower() == 'true'
+    # Inline <style>/<script> blocks at least this large are moved to shared, content-hashed assets
+    SLIDE_ASSET_MIN_BYTES = int(os.getenv('SLIDE_ASSET_MIN_BYTES', '1024'))
+    SLIDE_CACHE_CONTROL = os.getenv('SLIDE_CACHE_CONTROL', 'public, max-age=86400')
+    SLIDE_ASSET_CACHE_CONTROL = os.getenv('SLIDE_ASSET_CACHE_CONTROL', 'public, max-age=31536000, immutable')
+
+    # Database settings
+    DB_USER = os.getenv('DB_USER')
+    DB_PASSWORD = os.getenv('DB_PASSWORD')
+    DB_HOST = os.getenv('DB_HOST')
+    DB_NAME = os.getenv('DB_NAME')
+    # Overrides DB_USER/DB_PASSWORD/DB_HOST/DB_NAME when set (e.g. sqlite:// for tests)
+    DATABASE_URL = os.getenv('DATABASE_URL')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+    # Codec for stored summary bodies: zstd (needs the zstandard package) or gzip
+    SUMMARY_COMPRESSION = os.getenv('SUMMARY_COMPRESSION', 'zstd')
+
+    # Distributed worker settings (see app.services.worker)
+    WORKER_LEASE_SECONDS = int(os.getenv('WORKER_LEASE_SECONDS', '300'))
+    WORKER_HEARTBEAT_INTERVAL = float(os.getenv('WORKER_HEARTBEAT_INTERVAL', '30'))
+    WORKER_POLL_INTERVAL = float(os.getenv('WORKER_POLL_INTERVAL', '10'))
+    WORKER_MAX_ATTEMPTS = int(os.getenv('WORKER_MAX_ATTEMPTS', '3'))
+
+    # Watch mode settings (see app.services.watcher)
+    # WATCH_SOURCE: s3 (poll the raw-files prefix) or queue (S3 event notifications spooled to WATCH_QUEUE_DIR)
+    WATCH_SOURCE = os.getenv('WATCH_SOURCE', 's3')
+    WATCH_QUEUE_DIR = os.getenv('WATCH_QUEUE_DIR', os.path.join(OUTPUT_DIR, 's3_events'))
+    WATCH_POLL_INTERVAL = float(os.getenv('WATCH_POLL_INTERVAL', '30'))
+    WATCH_WORKERS = int(os.getenv('WATCH_WORKERS', '2'))
+    # Failed uploads are retried on later polls until this many attempts
+    WATCH_MAX_ATTEMPTS = int(os.getenv('WATCH_MAX_ATTEMPTS', '3'))
+
+    # Per-job scratch directories (see app.services.scratch); defaults to OUTPUT_DIR
+    SCRATCH_DIR = os.getenv('SCRATCH_DIR', '')
+    SCRATCH_TMPFS = os.getenv('SCRATCH_TMPFS', 'false').lower() == 'true'
 
     # CloudFront settings
     CLOUDFRONT_URL = os.getenv('CLOUDFRONT_URL', 'https://d2is53fus238ee.cloudfront.net')
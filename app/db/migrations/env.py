@@ -17,6 +17,9 @@ DB_HOST = os.environ.get("DB_HOST")
 DB_NAME = os.environ.get("DB_NAME")
 
 def get_url():
+    # DATABASE_URL takes precedence, matching app.db.models.base.get_database_url
+    if os.environ.get("DATABASE_URL"):
+        return os.environ["DATABASE_URL"]
     user = quote_plus(DB_USER)
     password = quote_plus(DB_PASSWORD)
     return f"postgresql://{user}:{password}@{DB_HOST}/{DB_NAME}?sslmode=require"
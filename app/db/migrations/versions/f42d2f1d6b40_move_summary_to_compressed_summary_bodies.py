@@ -0,0 +1,115 @@
+"""Move summary to compressed summary_bodies
+
+Revision ID: f42d2f1d6b40
+Revises: 200e51358645
+Create Date: 2026-10-18 10:12:31.402118
+
+"""
+import gzip
+import hashlib
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f42d2f1d6b40'
+down_revision: Union[str, None] = '200e51358645'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+# Codec used for the backfill. The helpers below are frozen copies of the ones in
+# app.db.models.summary_bodies so this revision does not change when the model does.
+CODEC = 'zstd' if zstandard is not None else 'gzip'
+
+
+def compress_text(text: str, codec: str) -> bytes:
+    data = text.encode('utf-8')
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def decompress_text(data: bytes, codec: str) -> str:
+    if codec == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'gzip':
+        return gzip.decompress(data).decode('utf-8')
+    raise ValueError(f'Unsupported compression codec: {codec}')
+
+summary_pages = sa.table(
+    'summary_pages',
+    sa.column('id', sa.String),
+    sa.column('summary', sa.String),
+)
+summary_bodies = sa.table(
+    'summary_bodies',
+    sa.column('summary_page_id', sa.String),
+    sa.column('codec', sa.String),
+    sa.column('content_hash', sa.String),
+    sa.column('raw_size', sa.Integer),
+    sa.column('body', sa.LargeBinary),
+    sa.column('updated_at', sa.DateTime),
+)
+
+
+def upgrade() -> None:
+    op.create_table('summary_bodies',
+    sa.Column('summary_page_id', sa.String(), nullable=False),
+    sa.Column('codec', sa.String(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('raw_size', sa.Integer(), nullable=False),
+    sa.Column('body', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['summary_page_id'], ['summary_pages.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('summary_page_id')
+    )
+
+    # Backfill existing summaries in batches
+    connection = op.get_bind()
+    codec = CODEC
+    rows = connection.execute(
+        sa.select(summary_pages.c.id, summary_pages.c.summary).where(summary_pages.c.summary.isnot(None))
+    )
+    while True:
+        batch = rows.fetchmany(BATCH_SIZE)
+        if not batch:
+            break
+        connection.execute(summary_bodies.insert(), [
+            {
+                'summary_page_id': row.id,
+                'codec': codec,
+                'content_hash': hashlib.sha256(row.summary.encode('utf-8')).hexdigest(),
+                'raw_size': len(row.summary.encode('utf-8')),
+                'body': compress_text(row.summary, codec),
+                'updated_at': datetime.now(),
+            }
+            for row in batch
+        ])
+
+    op.drop_column('summary_pages', 'summary')
+
+
+def downgrade() -> None:
+    op.add_column('summary_pages', sa.Column('summary', sa.String(), nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(summary_bodies.c.summary_page_id, summary_bodies.c.codec, summary_bodies.c.body)
+    ).fetchall()
+    for row in rows:
+        connection.execute(
+            summary_pages.update()
+            .where(summary_pages.c.id == row.summary_page_id)
+            .values(summary=decompress_text(row.body, row.codec))
+        )
+
+    op.drop_table('summary_bodies')
@@ -1 +1,5 @@
-from .summary_pages import SummaryPage  # noqa
\ No newline at end of file
+from .summary_pages import SummaryPage  # noqa
+from .summary_bodies import SummaryBody  # noqa
+from .paper_jobs import PaperJob  # noqa
+from .paper_signatures import PaperSignature, PaperSignatureBand  # noqa
+from .llm_usages import LLMUsage  # noqa
@@ -1,21 +1,131 @@
-from typing import Any, Callable
+from typing import Any, Callable, Dict, Iterator, Optional
+from contextlib import contextmanager
 from functools import wraps
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm.session import Session
 from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-import os
+from sqlalchemy.pool import StaticPool
+from urllib.parse import quote_plus
+import threading
+import time
 import uuid
 from datetime import datetime
 
-engine = create_engine(
-    "postgresql://{user}:{password}@{host}/{dbname}".format(
-        user=os.environ.get("DB_USER"),
-        password=os.environ.get("DB_PASSWORD"),
-        host=os.environ.get("DB_HOST"),
-        dbname=os.environ.get("DB_NAME"),
+from app.config import config
+
+
+def get_database_url() -> str:
+    """
+    Resolve the database URL from the config.
+
+    Returns:
+        str: ``DATABASE_URL`` if set, otherwise a PostgreSQL URL built from the DB_* settings.
+    """
+    if config.DATABASE_URL:
+        return config.DATABASE_URL
+    return "postgresql://{user}:{password}@{host}/{dbname}".format(
+        user=quote_plus(config.DB_USER or ""),
+        password=quote_plus(config.DB_PASSWORD or ""),
+        host=config.DB_HOST,
+        dbname=config.DB_NAME,
     )
-)
+
+
+class PoolMetrics:
+    """Counters for connection pool activity, updated from pool events and session scopes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            # Time for a unit of work to get its connection: pool checkout, connecting and the pre-ping
+            self.acquire_count = 0
+            self.acquire_seconds_total = 0.0
+            self.acquire_seconds_max = 0.0
+
+    def incr(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def record_acquire(self, seconds: float):
+        with self._lock:
+            self.acquire_count += 1
+            self.acquire_seconds_total += seconds
+            self.acquire_seconds_max = max(self.acquire_seconds_max, seconds)
+
+    def snapshot(self, bound_engine: Engine) -> Dict[str, Any]:
+        pool = bound_engine.pool
+        with self._lock:
+            stats = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "acquire_count": self.acquire_count,
+                "acquire_seconds_total": round(self.acquire_seconds_total, 6),
+                "acquire_seconds_max": round(self.acquire_seconds_max, 6),
+                "acquire_seconds_avg": (
+                    round(self.acquire_seconds_total / self.acquire_count, 6) if self.acquire_count else 0.0
+                ),
+            }
+        stats["pool_status"] = pool.status()
+        # Only QueuePool exposes live size/overflow numbers
+        for attr in ("size", "checkedout", "overflow", "checkedin"):
+            if hasattr(pool, attr):
+                stats[f"pool_{attr}"] = getattr(pool, attr)()
+        return stats
+
+
+pool_metrics = PoolMetrics()
+
+
+def _attach_pool_listeners(bound_engine: Engine):
+    event.listen(bound_engine, "connect", lambda *args: pool_metrics.incr("connects"))
+    event.listen(bound_engine, "checkout", lambda *args: pool_metrics.incr("checkouts"))
+    event.listen(bound_engine, "checkin", lambda *args: pool_metrics.incr("checkins"))
+    event.listen(bound_engine, "invalidate", lambda *args: pool_metrics.incr("invalidations"))
+
+
+def build_engine(url: Optional[str] = None, **overrides: Any) -> Engine:
+    """
+    Create an engine with pool settings taken from the config.
+
+    Args:
+        url (Optional[str]): Database URL. Defaults to ``get_database_url()``.
+        **overrides: Extra keyword arguments passed to ``create_engine``.
+
+    Returns:
+        Engine: The configured engine.
+    """
+    url = url or get_database_url()
+    kwargs: Dict[str, Any] = {"pool_pre_ping": config.DB_POOL_PRE_PING}
+    if url.startswith("sqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if url in ("sqlite://", "sqlite:///:memory:"):
+            # In-memory databases only exist per connection, so share a single one
+            kwargs["poolclass"] = StaticPool
+    else:
+        kwargs.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+        )
+    kwargs.update(overrides)
+    bound_engine = create_engine(url, **kwargs)
+    _attach_pool_listeners(bound_engine)
+    return bound_engine
+
+
+engine = build_engine()
 
 Base = declarative_base()
 
@@ -27,11 +137,77 @@ ScopedSession = scoped_session(
 )
 
 
+def configure_engine(url: Optional[str] = None, **overrides: Any) -> Engine:
+    """
+    Rebuild the engine (e.g. after changing the config) and rebind ``ScopedSession`` to it.
+
+    Args:
+        url (Optional[str]): Database URL. Defaults to ``get_database_url()``.
+        **overrides: Extra keyword arguments passed to ``create_engine``.
+
+    Returns:
+        Engine: The new engine.
+    """
+    global engine
+    ScopedSession.remove()
+    engine.dispose()
+    engine = build_engine(url, **overrides)
+    ScopedSession.configure(bind=engine)
+    pool_metrics.reset()
+    return engine
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Return connection pool counters and the current pool status."""
+    return pool_metrics.snapshot(engine)
+
+
+_scope_state = threading.local()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Unit-of-work scope around the thread's ``ScopedSession``.
+
+    The outermost scope commits on success, rolls back on error and releases the
+    connection back to the pool. Nested scopes reuse the same session, so several
+    model calls made for one paper share a single connection and transaction.
+
+    Yields:
+        Session: The thread-local session.
+    """
+    session: Session = ScopedSession()
+    depth = getattr(_scope_state, "depth", 0)
+    if depth > 0:
+        _scope_state.depth = depth + 1
+        try:
+            yield session
+        finally:
+            _scope_state.depth = depth
+        return
+
+    _scope_state.depth = 1
+    try:
+        # Only the outermost scope acquires a connection; nested scopes reuse it
+        start = time.perf_counter()
+        session.connection()
+        pool_metrics.record_acquire(time.perf_counter() - start)
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        _scope_state.depth = 0
+        ScopedSession.remove()
+
+
 class ModelInterface:
     @classmethod
     def find(cls, idn):
-        db = ScopedSession()
-        return db.query(cls).filter(cls.id == idn).first()
+        with session_scope() as session:
+            return session.query(cls).filter(cls.id == idn).first()
 
     @classmethod
     def create(cls, **kwargs):
@@ -42,18 +218,10 @@ class ModelInterface:
 
 
 def entrypoint(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Run ``func`` inside a ``session_scope`` unit of work."""
     @wraps(func)
     def _entry_point(*args: Any, **keywords: Any) -> Any:
-        session: Session = ScopedSession()
-        try:
-            result = func(*args, **keywords)
-        except Exception as e:
-            session.rollback()
-            raise e
-        else:
-            session.commit()
-        finally:
-            ScopedSession.remove()
-        return result
+        with session_scope():
+            return func(*args, **keywords)
 
     return _entry_point
@@ -0,0 +1,128 @@
+import uuid
+import sqlalchemy as sa
+from datetime import datetime
+from typing import List, Optional
+
+from .base import Base, session_scope
+
+
+class LLMUsage(Base):
+    """Token usage and latency of one LLM call made while summarizing a paper."""
+    __tablename__ = "llm_usages"
+
+    id = sa.Column(sa.String, primary_key=True)
+    summary_page_id = sa.Column(sa.String, sa.ForeignKey("summary_pages.id", ondelete="SET NULL"), index=True)
+    object_key = sa.Column(sa.String, index=True)
+    # Size of the source PDF, used to estimate the token cost of papers not processed yet
+    pdf_bytes = sa.Column(sa.Integer)
+    stage = sa.Column(sa.String, nullable=False)
+    tier = sa.Column(sa.String)
+    model_id = sa.Column(sa.String)
+    input_tokens = sa.Column(sa.Integer, nullable=False)
+    output_tokens = sa.Column(sa.Integer, nullable=False)
+    latency_seconds = sa.Column(sa.Float, nullable=False)
+    created_at = sa.Column(sa.DateTime, index=True)
+
+    def __repr__(self):
+        return f"<LLMUsage {self.object_key} {self.stage} {self.input_tokens}+{self.output_tokens}>"
+
+    @classmethod
+    def record_many(cls, summary_page_id: Optional[str], object_key: str, pdf_bytes: Optional[int],
+                    usages: List[dict]):
+        """
+        Store the calls made for one paper.
+
+        Args:
+            summary_page_id (Optional[str]): The SummaryPage the calls produced, if any.
+            object_key (str): File name of the PDF.
+            pdf_bytes (Optional[int]): Size of the PDF.
+            usages (List[dict]): Entries collected by ``ModelRouter`` (stage, tier, model_id, tokens, latency).
+        """
+        now = datetime.now()
+        with session_scope() as session:
+            session.add_all(
+                cls(
+                    id=str(uuid.uuid4()),
+                    summary_page_id=summary_page_id,
+                    object_key=object_key,
+                    pdf_bytes=pdf_bytes,
+                    stage=usage['stage'],
+                    tier=usage.get('tier'),
+                    model_id=usage.get('model_id'),
+                    input_tokens=usage.get('input_tokens', 0),
+                    output_tokens=usage.get('output_tokens', 0),
+                    latency_seconds=usage.get('latency_seconds', 0.0),
+                    created_at=now,
+                )
+                for usage in usages
+            )
+
+    @classmethod
+    def report(cls, since: Optional[datetime] = None, group_by: str = "model_id") -> List[dict]:
+        """
+        Aggregate token usage and latency.
+
+        Args:
+            since (Optional[datetime]): Only include calls made after this time.
+            group_by (str): ``model_id``, ``stage``, ``tier`` or ``day``.
+
+        Returns:
+            List[dict]: One row per group with call/paper counts, token totals and latency.
+        """
+        if group_by == "day":
+            key = sa.func.date(cls.created_at)
+        elif group_by in ("model_id", "stage", "tier"):
+            key = getattr(cls, group_by)
+        else:
+            raise ValueError(f"Unsupported group_by: {group_by}")
+
+        with session_scope() as session:
+            query = session.query(
+                key.label("key"),
+                sa.func.count(cls.id).label("calls"),
+                sa.func.count(sa.distinct(cls.object_key)).label("papers"),
+                sa.func.sum(cls.input_tokens).label("input_tokens"),
+                sa.func.sum(cls.output_tokens).label("output_tokens"),
+                sa.func.sum(cls.latency_seconds).label("latency_seconds"),
+                sa.func.max(cls.latency_seconds).label("max_latency_seconds"),
+            )
+            if since is not None:
+                query = query.filter(cls.created_at >= since)
+            rows = query.group_by(key).order_by(key).all()
+
+        return [
+            {
+                group_by: str(row.key) if row.key is not None else None,
+                "calls": row.calls,
+                "papers": row.papers,
+                "input_tokens": int(row.input_tokens or 0),
+                "output_tokens": int(row.output_tokens or 0),
+                "total_tokens": int((row.input_tokens or 0) + (row.output_tokens or 0)),
+                "latency_seconds": round(float(row.latency_seconds or 0), 3),
+                "avg_latency_seconds": round(float(row.latency_seconds or 0) / row.calls, 3) if row.calls else 0.0,
+                "max_latency_seconds": round(float(row.max_latency_seconds or 0), 3),
+            }
+            for row in rows
+        ]
+
+    @classmethod
+    def cost_rates(cls) -> dict:
+        """
+        Historical per-paper cost rates for estimating unprocessed papers.
+
+        Returns:
+            dict: ``tokens_per_pdf_byte`` and ``seconds_per_token`` (None when there is no history).
+        """
+        with session_scope() as session:
+            tokens, latency = session.query(
+                sa.func.sum(cls.input_tokens + cls.output_tokens),
+                sa.func.sum(cls.latency_seconds),
+            ).one()
+            # Each paper's size counts once, on its summarize call
+            pdf_bytes = session.query(sa.func.sum(cls.pdf_bytes)).filter(cls.stage == "summarize").scalar()
+
+        tokens = int(tokens or 0)
+        return {
+            "tokens_per_pdf_byte": tokens / pdf_bytes if tokens and pdf_bytes else None,
+            "seconds_per_token": float(latency) / tokens if tokens and latency else None,
+        }
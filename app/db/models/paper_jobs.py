@@ -0,0 +1,186 @@
+import uuid
+import sqlalchemy as sa
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from app.config import config
+from .base import Base, ModelInterface, session_scope
+
+
+class PaperJob(Base, ModelInterface):
+    """A paper waiting to be summarized, leased to one worker at a time."""
+    __tablename__ = "paper_jobs"
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    id = sa.Column(sa.String, primary_key=True)
+    object_key = sa.Column(sa.String, nullable=False, unique=True)
+    status = sa.Column(sa.String, nullable=False, index=True)
+    worker_id = sa.Column(sa.String)
+    attempts = sa.Column(sa.Integer, nullable=False)
+    lease_expires_at = sa.Column(sa.DateTime)
+    heartbeat_at = sa.Column(sa.DateTime)
+    last_error = sa.Column(sa.String)
+    created_at = sa.Column(sa.DateTime)
+    updated_at = sa.Column(sa.DateTime)
+
+    def __init__(self, object_key: str):
+        self.id = str(uuid.uuid4())
+        self.object_key = object_key
+        self.status = self.STATUS_PENDING
+        self.attempts = 0
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+    def __repr__(self):
+        return f"<PaperJob {self.id} {self.object_key} {self.status}>"
+
+    @classmethod
+    def enqueue(cls, object_keys: Iterable[str]) -> List[str]:
+        """
+        Add jobs for object keys that are not queued yet.
+
+        Args:
+            object_keys (Iterable[str]): Object keys (file names) under the raw-files prefix.
+
+        Returns:
+            List[str]: The object keys that were newly enqueued.
+        """
+        object_keys = list(dict.fromkeys(object_keys))
+        with session_scope() as session:
+            existing = {
+                key for (key,) in session.query(cls.object_key).filter(cls.object_key.in_(object_keys))
+            }
+            new_keys = [key for key in object_keys if key not in existing]
+            if not new_keys:
+                return []
+            rows = [
+                {"id": job.id, "object_key": job.object_key, "status": job.status, "attempts": job.attempts,
+                 "created_at": job.created_at, "updated_at": job.updated_at}
+                for job in (cls(key) for key in new_keys)
+            ]
+            if session.bind.dialect.name == "postgresql":
+                # Another node may enqueue the same key concurrently
+                from sqlalchemy.dialects.postgresql import insert
+                session.execute(insert(cls).values(rows).on_conflict_do_nothing(index_elements=["object_key"]))
+            else:
+                session.execute(sa.insert(cls), rows)
+            return new_keys
+
+    @staticmethod
+    def _db_now(session) -> datetime:
+        # Leases are compared across nodes, so they use the database clock instead of each node's own
+        now = session.execute(sa.select(sa.func.now(type_=sa.DateTime))).scalar()
+        return now.replace(tzinfo=None)
+
+    @classmethod
+    def claim(cls, worker_id: str, lease_seconds: int, max_attempts: Optional[int] = None) -> Optional["PaperJob"]:
+        """
+        Lease the oldest pending job, or a running job whose lease has expired.
+
+        Uses ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent workers never claim the same row.
+        An expired job that already used ``max_attempts`` (its worker died on it every time) is
+        marked failed instead of being handed out again.
+
+        Args:
+            worker_id (str): Identifier of the claiming worker.
+            lease_seconds (int): How long the lease lasts without a heartbeat.
+            max_attempts (Optional[int]): Attempts before a job is marked failed. Defaults to WORKER_MAX_ATTEMPTS.
+
+        Returns:
+            Optional[PaperJob]: The claimed job, or None if there is nothing to do.
+        """
+        max_attempts = max_attempts or config.WORKER_MAX_ATTEMPTS
+        with session_scope() as session:
+            now = cls._db_now(session)
+            while True:
+                job = (
+                    session.query(cls)
+                    .filter(sa.or_(
+                        cls.status == cls.STATUS_PENDING,
+                        sa.and_(cls.status == cls.STATUS_RUNNING, cls.lease_expires_at < now),
+                    ))
+                    .order_by(cls.created_at)
+                    .with_for_update(skip_locked=True)
+                    .first()
+                )
+                if job is None:
+                    return None
+                if job.status == cls.STATUS_RUNNING and job.attempts >= max_attempts:
+                    job.status = cls.STATUS_FAILED
+                    job.last_error = f"Lease of {job.worker_id} expired on attempt {job.attempts}"
+                    job.lease_expires_at = None
+                    job.updated_at = now
+                    session.flush()
+                    continue
+                break
+            job.status = cls.STATUS_RUNNING
+            job.worker_id = worker_id
+            job.attempts += 1
+            job.heartbeat_at = now
+            job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+            job.updated_at = now
+            return job
+
+    @classmethod
+    def _update_owned(cls, job_id: str, worker_id: str, **values) -> bool:
+        # Only the current lease holder may touch a running job
+        with session_scope() as session:
+            updated = session.query(cls).filter(
+                cls.id == job_id,
+                cls.worker_id == worker_id,
+                cls.status == cls.STATUS_RUNNING,
+            ).update(dict(values, updated_at=datetime.now()), synchronize_session=False)
+            return updated == 1
+
+    @classmethod
+    def heartbeat(cls, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """
+        Extend the lease of a running job.
+
+        Returns:
+            bool: False if the lease was lost (expired and reclaimed by another worker).
+        """
+        with session_scope() as session:
+            now = cls._db_now(session)
+            return cls._update_owned(
+                job_id, worker_id,
+                heartbeat_at=now,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+            )
+
+    @classmethod
+    def complete(cls, job_id: str, worker_id: str) -> bool:
+        """
+        Mark a job as done.
+
+        Returns:
+            bool: False if the lease was lost before completion.
+        """
+        return cls._update_owned(job_id, worker_id, status=cls.STATUS_DONE, lease_expires_at=None)
+
+    @classmethod
+    def fail(cls, job_id: str, worker_id: str, error: str, max_attempts: int) -> bool:
+        """
+        Record a failure, returning the job to the queue until ``max_attempts`` is reached.
+
+        Returns:
+            bool: False if the lease was lost before the failure was recorded.
+        """
+        with session_scope() as session:
+            job = session.query(cls).filter(cls.id == job_id).first()
+            status = cls.STATUS_FAILED if job is not None and job.attempts >= max_attempts else cls.STATUS_PENDING
+            return cls._update_owned(
+                job_id, worker_id,
+                status=status,
+                last_error=error,
+                lease_expires_at=None,
+            )
+
+    @classmethod
+    def count_by_status(cls) -> dict:
+        with session_scope() as session:
+            return dict(session.query(cls.status, sa.func.count(cls.id)).group_by(cls.status).all())
@@ -0,0 +1,81 @@
+import sqlalchemy as sa
+from datetime import datetime
+from typing import List, Tuple
+
+from .base import Base, session_scope
+
+
+class PaperSignature(Base):
+    """MinHash signature of a paper's extracted text, used for near-duplicate detection."""
+    __tablename__ = "paper_signatures"
+
+    summary_page_id = sa.Column(sa.String, sa.ForeignKey("summary_pages.id", ondelete="CASCADE"), primary_key=True)
+    num_perm = sa.Column(sa.Integer, nullable=False)
+    signature = sa.Column(sa.LargeBinary, nullable=False)
+    created_at = sa.Column(sa.DateTime)
+
+    def __repr__(self):
+        return f"<PaperSignature {self.summary_page_id} {self.num_perm}>"
+
+    @classmethod
+    def store(cls, summary_page_id: str, signature: bytes, bands: List[Tuple[int, int]]):
+        """
+        Insert or replace a signature and its LSH band hashes.
+
+        Args:
+            summary_page_id (str): The SummaryPage the signature belongs to.
+            signature (bytes): The packed MinHash signature (uint32 values).
+            bands (List[Tuple[int, int]]): ``(band_index, band_hash)`` pairs.
+        """
+        with session_scope() as session:
+            session.query(PaperSignatureBand).filter(PaperSignatureBand.summary_page_id == summary_page_id).delete()
+            session.merge(cls(
+                summary_page_id=summary_page_id,
+                num_perm=len(signature) // 4,
+                signature=signature,
+                created_at=datetime.now(),
+            ))
+            session.add_all(
+                PaperSignatureBand(summary_page_id=summary_page_id, band_index=band_index, band_hash=band_hash)
+                for band_index, band_hash in bands
+            )
+
+    @classmethod
+    def get_candidates(cls, bands: List[Tuple[int, int]]) -> List[Tuple[str, bytes]]:
+        """
+        Fetch the signatures of papers sharing at least one band hash.
+
+        Args:
+            bands (List[Tuple[int, int]]): ``(band_index, band_hash)`` pairs of the query signature.
+
+        Returns:
+            List[Tuple[str, bytes]]: ``(summary_page_id, signature)`` of each candidate.
+        """
+        if not bands:
+            return []
+        with session_scope() as session:
+            candidate_ids = (
+                session.query(PaperSignatureBand.summary_page_id)
+                .filter(sa.tuple_(PaperSignatureBand.band_index, PaperSignatureBand.band_hash).in_(bands))
+                .distinct()
+            )
+            return [
+                (row.summary_page_id, row.signature)
+                for row in session.query(cls.summary_page_id, cls.signature).filter(
+                    cls.summary_page_id.in_(candidate_ids.scalar_subquery())
+                )
+            ]
+
+
+class PaperSignatureBand(Base):
+    """One LSH band hash of a PaperSignature, indexed for sub-linear candidate lookup."""
+    __tablename__ = "paper_signature_bands"
+    __table_args__ = (
+        sa.Index("ix_paper_signature_bands_band", "band_index", "band_hash"),
+    )
+
+    summary_page_id = sa.Column(
+        sa.String, sa.ForeignKey("paper_signatures.summary_page_id", ondelete="CASCADE"), primary_key=True
+    )
+    band_index = sa.Column(sa.Integer, primary_key=True)
+    band_hash = sa.Column(sa.BigInteger, nullable=False)
@@ -0,0 +1,87 @@
+import gzip
+import hashlib
+import sqlalchemy as sa
+from datetime import datetime
+
+from app.config import config
+from .base import Base
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+
+def compress_text(text: str, codec: str) -> bytes:
+    """
+    Compress text with the given codec.
+
+    Args:
+        text (str): The text to compress.
+        codec (str): ``zstd`` or ``gzip``.
+
+    Returns:
+        bytes: The compressed bytes.
+    """
+    data = text.encode("utf-8")
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    raise ValueError(f"Unsupported compression codec: {codec}")
+
+
+def decompress_text(data: bytes, codec: str) -> str:
+    """
+    Decompress bytes produced by ``compress_text``.
+
+    Args:
+        data (bytes): The compressed bytes.
+        codec (str): ``zstd`` or ``gzip``.
+
+    Returns:
+        str: The original text.
+    """
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "gzip":
+        return gzip.decompress(data).decode("utf-8")
+    raise ValueError(f"Unsupported compression codec: {codec}")
+
+
+def default_codec() -> str:
+    """Return the configured codec, falling back to gzip when zstandard is not installed."""
+    if config.SUMMARY_COMPRESSION == "zstd" and zstandard is None:
+        return "gzip"
+    return config.SUMMARY_COMPRESSION
+
+
+class SummaryBody(Base):
+    """Compressed Marp markdown of a SummaryPage, stored apart from the listing fields."""
+    __tablename__ = "summary_bodies"
+
+    summary_page_id = sa.Column(sa.String, sa.ForeignKey("summary_pages.id", ondelete="CASCADE"), primary_key=True)
+    codec = sa.Column(sa.String, nullable=False)
+    content_hash = sa.Column(sa.String(64), nullable=False)
+    raw_size = sa.Column(sa.Integer, nullable=False)
+    body = sa.Column(sa.LargeBinary, nullable=False)
+    updated_at = sa.Column(sa.DateTime)
+
+    def __repr__(self):
+        return f"<SummaryBody {self.summary_page_id} {self.codec} {self.raw_size}B>"
+
+    @property
+    def text(self) -> str:
+        return decompress_text(self.body, self.codec)
+
+    @text.setter
+    def text(self, value: str):
+        value = value or ""
+        content_hash = hashlib.sha256(value.encode("utf-8")).hexdigest()
+        if content_hash == self.content_hash:
+            return
+        self.codec = default_codec()
+        self.content_hash = content_hash
+        self.raw_size = len(value.encode("utf-8"))
+        self.body = compress_text(value, self.codec)
+        self.updated_at = datetime.now()
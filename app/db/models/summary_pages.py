@@ -1,8 +1,11 @@
 import uuid
 import sqlalchemy as sa
+from typing import Iterator, List, Optional
+from sqlalchemy.orm import relationship, selectinload
 from datetime import datetime
 
-from .base import Base, ModelInterface, ScopedSession
+from .base import Base, ModelInterface, session_scope
+from .summary_bodies import SummaryBody, decompress_text
 
 
 class SummaryPage(Base, ModelInterface):
@@ -11,38 +14,67 @@ class SummaryPage(Base, ModelInterface):
     id = sa.Column(sa.String, primary_key=True)
     title = sa.Column(sa.String)
     url = sa.Column(sa.String)
-    summary = sa.Column(sa.String)
+    # sha256 of the last published slide HTML, used to skip unchanged decks on re-render
+    html_hash = sa.Column(sa.String(64))
+    # Set when this paper was detected as a near-duplicate and linked to an existing deck
+    duplicate_of_id = sa.Column(sa.String, sa.ForeignKey("summary_pages.id", ondelete="SET NULL"))
     created_at = sa.Column(sa.DateTime)
     updated_at = sa.Column(sa.DateTime)
 
+    # The markdown body lives in summary_bodies and is only loaded when accessed
+    # (or when requested up front with with_summary=True).
+    body = relationship(
+        SummaryBody,
+        uselist=False,
+        lazy="select",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
     def __init__(self, title: str, url: str):
         self.id = str(uuid.uuid4())
         self.title = title
         self.url = url
-        self.summary = ""
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
 
     def __repr__(self):
         return f"<SummaryPage {self.id} {self.title} {self.url}>"
 
+    @property
+    def summary(self) -> str:
+        state = sa.inspect(self)
+        if state.detached and "body" in state.unloaded:
+            # Returned by a query without with_summary=True after its session closed
+            return self.get_summary_by_id(self.id) or ""
+        return self.body.text if self.body else ""
+
+    @summary.setter
+    def summary(self, value: str):
+        if self.body is None:
+            self.body = SummaryBody(summary_page_id=self.id)
+        self.body.text = value
+
     @classmethod
-    def get_all(cls):
-        with ScopedSession() as session:
-            return session.query(cls).all()
+    def get_all(cls, with_summary: bool = False):
+        with session_scope() as session:
+            query = session.query(cls)
+            if with_summary:
+                query = query.options(selectinload(cls.body))
+            return query.all()
 
     @classmethod
     def get_summary_by_id(cls, id):
-        with ScopedSession() as session:
-            record = session.query(cls).filter(cls.id == id).first()
-            summary = record.summary if record else None
+        with session_scope() as session:
+            record = session.query(SummaryBody).filter(SummaryBody.summary_page_id == id).first()
+            summary = record.text if record else None
             return summary
 
     @classmethod
-    def insert_or_update_record(cls, title: str, url: str, summary: str):
-        with ScopedSession() as session:
+    def insert_or_update_record(cls, title: str, url: str, summary: str, html_hash: Optional[str] = None):
+        with session_scope() as session:
             record = session.query(SummaryPage).filter(
-                SummaryPage.title == title, 
+                SummaryPage.title == title,
                 SummaryPage.url == url
             ).first()
             if record:
@@ -52,11 +84,100 @@ class SummaryPage(Base, ModelInterface):
                 record = SummaryPage(title=title, url=url)
                 record.summary = summary
                 session.add(record)
-            session.commit()
+            if html_hash is not None:
+                record.html_hash = html_hash
+            session.flush()
+            return record.id
+
+    @classmethod
+    def insert_duplicate_link(cls, title: str, original_id: str, link: bool = True):
+        """
+        Record a near-duplicate paper that reuses the deck of an existing page instead of being summarized.
+
+        Args:
+            title (str): Title (file stem) of the duplicate paper.
+            original_id (str): Id of the page it duplicates.
+            link (bool): Point the record at the original deck. If False the record has no URL
+                and only marks the paper as handled so it is not fetched again.
+
+        Returns:
+            str: The id of the linked record.
+        """
+        with session_scope() as session:
+            original = session.query(cls).filter(cls.id == original_id).one()
+            url = original.url if link else None
+            record = session.query(cls).filter(cls.title == title, cls.url == url).first()
+            if record is None:
+                record = SummaryPage(title=title, url=url)
+                session.add(record)
+            record.duplicate_of_id = original.id
+            record.html_hash = original.html_hash if link else None
+            record.updated_at = datetime.now()
+            session.flush()
             return record.id
 
     @classmethod
-    def get_record_by_title(cls, title: str):
-        with ScopedSession() as session:
-            record = session.query(cls).filter(cls.title == title).first()
+    def get_record_by_title(cls, title: str, with_summary: bool = False):
+        with session_scope() as session:
+            query = session.query(cls).filter(cls.title == title)
+            if with_summary:
+                query = query.options(selectinload(cls.body))
+            record = query.first()
             return record
+
+    @classmethod
+    def iter_summary_batches(cls, batch_size: int, after_id: Optional[str] = None,
+                             ids: Optional[List[str]] = None) -> Iterator[List[dict]]:
+        """
+        Stream pages with their summaries in id order, one short-lived session per batch.
+
+        Near-duplicate links are left out: they have no summary of their own and point at
+        another page's deck.
+
+        Args:
+            batch_size (int): Number of pages per batch.
+            after_id (Optional[str]): Only pages with a greater id are returned (for resuming).
+            ids (Optional[List[str]]): Only return these pages (for retrying failures).
+
+        Yields:
+            List[dict]: ``id``, ``title``, ``url``, ``html_hash`` and ``summary`` of each page.
+        """
+        while True:
+            with session_scope() as session:
+                query = (
+                    session.query(cls.id, cls.title, cls.url, cls.html_hash, SummaryBody.codec, SummaryBody.body)
+                    .join(SummaryBody, SummaryBody.summary_page_id == cls.id)
+                    .filter(cls.duplicate_of_id.is_(None))
+                )
+                if after_id is not None:
+                    query = query.filter(cls.id > after_id)
+                if ids is not None:
+                    query = query.filter(cls.id.in_(ids))
+                rows = query.order_by(cls.id).limit(batch_size).all()
+            if not rows:
+                return
+            yield [
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "url": row.url,
+                    "html_hash": row.html_hash,
+                    "summary": decompress_text(row.body, row.codec),
+                }
+                for row in rows
+            ]
+            after_id = rows[-1].id
+
+    @classmethod
+    def set_html_hashes(cls, html_hashes: dict):
+        """
+        Store the published HTML hash of several pages.
+
+        Args:
+            html_hashes (dict): ``{page_id: html_hash}``.
+        """
+        with session_scope() as session:
+            for page_id, html_hash in html_hashes.items():
+                session.query(cls).filter(cls.id == page_id).update(
+                    {cls.html_hash: html_hash, cls.updated_at: datetime.now()}, synchronize_session=False
+                )
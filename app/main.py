@@ -1,14 +1,31 @@
 import os
-import glob
+import re
+import logging
+import argparse
+import json
+import signal
+from datetime import datetime, timedelta
+from typing import List, Optional
 from dotenv import load_dotenv
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from app.services.s3_file_handler import S3FileHandler
-from app.services.llm_handler import LLMHandler
+from app.services.model_router import ModelRouter
+from app.services.worker import Worker
+from app.services.batch_scheduler import BudgetScheduler, PaperFailed
+from app.services.watcher import InboxWatcher, LocalQueueSource, S3PollingSource
+from app.services.rebuild_decks import DeckRebuilder
+from app.services.near_duplicates import minhash_signature, find_near_duplicate, record_signature
 from app.services.markdown_handler import convert_markdown_to_html
-from app.services.read_pdf import read_pdf, save_text
+from app.services.html_optimizer import publish_slide, html_file_hash
+from app.services.read_pdf import save_text
+from app.services.scratch import job_scratch_dir
+from app.services.extract_sections import extract_paper
 from app.services.create_prompt import create_system_prompt
 from app.db.models.summary_pages import SummaryPage
+from app.db.models.paper_jobs import PaperJob
+from app.db.models.llm_usages import LLMUsage
+from app.db.models.base import session_scope, get_pool_metrics
 from app.config import config
 
 import arxiv
@@ -38,6 +55,14 @@ format_check_llm_system_prompt = f"""
 """
 
 
+def build_s3_file_handler() -> S3FileHandler:
+    return S3FileHandler(
+        aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+        region_name=config.AWS_DEFAULT_REGION
+    )
+
+
 def main():
     """
     Main function to orchestrate the PDF processing workflow.
@@ -52,38 +77,79 @@ def main():
     7. Convert the markdown to a PDF slide.
     """
     # Initialize PDFFetcher
-    s3_file_handler = S3FileHandler(
-        aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
-        region_name=config.AWS_DEFAULT_REGION
-    )
+    s3_file_handler = build_s3_file_handler()
+
+    model_router = ModelRouter()
 
     # Get the PDF file list from S3
     pdf_file_lists = s3_file_handler.get_file_lists(config.S3_BUCKET_NAME, config.S3_DOWNLOAD_FOLDER_DIR)
 
     for pdf_file in pdf_file_lists:
-        # If pdf file is already processed and stored in db, skip
-        pdf_title = os.path.splitext(pdf_file)[0]
-        if SummaryPage.get_record_by_title(pdf_title) is not None:
-            print(f"PDF {pdf_file} is already processed. Skipping...")
-            continue
+        process_pdf_file(pdf_file, s3_file_handler, model_router)
+
+
+def process_pdf_file(
+        pdf_file: str,
+        s3_file_handler: S3FileHandler,
+        model_router: ModelRouter,
+        usage_log: Optional[List[dict]] = None,
+    ) -> bool:
+    """
+    Summarize one PDF under the raw-files prefix and publish its slides.
+
+    Args:
+        pdf_file (str): File name of the PDF in the S3 raw-files folder.
+        s3_file_handler (S3FileHandler): Handler used to fetch the PDF and upload the slides.
+        model_router (ModelRouter): Router used for the LLM passes.
+        usage_log (Optional[List[dict]]): If given, receives the token usage and latency of each LLM call.
 
+    Returns:
+        bool: False if the PDF could not be fetched, True otherwise (including already processed PDFs).
+    """
+    # If pdf file is already processed and stored in db, skip
+    pdf_title = os.path.splitext(pdf_file)[0]
+    if SummaryPage.get_record_by_title(pdf_title) is not None:
+        print(f"PDF {pdf_file} is already processed. Skipping...")
+        return True
+
+    # Each job works in its own scratch directory, which is removed when the job ends
+    with job_scratch_dir(pdf_title) as scratch_dir:
         # Fetch PDF from S3
-        pdf_path = os.path.join('temp', pdf_file)
-        s3_file_handler.fetch_file(
+        pdf_path = s3_file_handler.fetch_file(
             config.S3_BUCKET_NAME,
             config.S3_DOWNLOAD_FOLDER_DIR,
             pdf_file,
-            pdf_path
+            os.path.join(scratch_dir, pdf_file)
         )
 
         if pdf_path:
+            usage_log = [] if usage_log is None else usage_log
+            pdf_bytes = os.path.getsize(pdf_path)
+
             # Process the PDF
             pdf_name = os.path.splitext(os.path.basename(pdf_path))[0]
-            pdf_text = read_pdf(pdf_path)
+            paper = extract_paper(pdf_path)
+            pdf_text = paper.prompt_text(config.PROMPT_EXCLUDED_SECTIONS)
+            extraction_report = paper.report(config.PROMPT_EXCLUDED_SECTIONS)
+            print(
+                f"Extracted sections {extraction_report['sections']} from {pdf_file}; "
+                f"dropped {extraction_report['dropped_sections']} "
+                f"({extraction_report['original_tokens']} -> {extraction_report['prompt_tokens']} tokens, "
+                f"saved {extraction_report['saved_tokens']})"
+            )
+
+            # Skip or link papers that are near-duplicates of an already summarized one (renames, new versions)
+            signature = minhash_signature(paper.text)
+            duplicate = find_near_duplicate(signature)
+            if duplicate is not None:
+                original_id, similarity = duplicate
+                print(f"PDF {pdf_file} is a near-duplicate of {original_id} (similarity {similarity:.2f})")
+                # Record skipped duplicates too, so later runs do not fetch and extract them again
+                SummaryPage.insert_duplicate_link(pdf_name, original_id, link=config.DEDUP_ACTION == 'link')
+                return True
 
             # Optionally save the extracted text
-            save_text(pdf_text, f'temp/{pdf_name}.txt')
+            save_text(pdf_text, os.path.join(scratch_dir, f'{pdf_name}.txt'))
 
             # Create prompt
             system_prompt = create_system_prompt(
@@ -92,70 +158,191 @@ def main():
                 config.CSS_TEMPLATE_PATH,
             )
 
-            # Prepare LLM
-            paper_summary_llm = LLMHandler(
-                temperature=config.TEMPERATURE,
-                max_tokens=config.MAX_TOKENS,
-                top_p=config.TOP_P
-            )
-
             content_prompt = f"pdfは以下の通り： \n\n{pdf_text}"
 
-            # Generate summary
-            output = paper_summary_llm.generate(system_prompt, content_prompt)
+            try:
+                # Generate summary on the tier that fits the paper, then format check on the cheapest tier
+                output = model_router.summarize(
+                    system_prompt,
+                    content_prompt,
+                    extraction_report['prompt_tokens'],
+                    extraction_report['sections'],
+                    usage_log=usage_log
+                )
+
+                output = model_router.format_check(
+                    format_check_llm_system_prompt,
+                    f"Marpコンテンツは以下の通り：\n\n{output}",
+                    usage_log=usage_log
+                )
+
+                # Write output to markdown file
+                out_md_file = os.path.join(scratch_dir, f'{pdf_name}.md')
+                with open(out_md_file, 'w') as file:
+                    file.write(output)
+
+                # Convert markdown to PDF
+                out_pdf_file = os.path.join(scratch_dir, f'{pdf_name}_slide.html')
+                convert_markdown_to_html(out_md_file, out_pdf_file)
+
+                published = publish_slide(
+                    s3_file_handler,
+                    out_pdf_file,
+                    config.S3_BUCKET_NAME,
+                    config.S3_UPLOAD_FOLDER_DIR,
+                    f'{pdf_name}_slide.html'
+                )
+                if not published:
+                    # Recording the page would point it at a deck that was never uploaded
+                    raise RuntimeError(f"Failed to upload the slide for {pdf_file}")
+                html_hash = html_file_hash(out_pdf_file)
+
+                # Insert record into the database in a single unit of work.
+                # The LLM calls above stay outside of it so no connection is held while waiting on them.
+                with session_scope():
+                    summary_page_id = SummaryPage.insert_or_update_record(
+                        pdf_name,
+                        f'{config.CLOUDFRONT_URL}/{config.S3_UPLOAD_FOLDER_DIR}/{pdf_name}_slide.html',
+                        output,
+                        html_hash=html_hash
+                    )
+                    record_signature(summary_page_id, signature)
+                    LLMUsage.record_many(summary_page_id, pdf_file, pdf_bytes, usage_log)
+            except Exception:
+                # The tokens were spent even though the paper failed; keep them in the usage report
+                if usage_log:
+                    LLMUsage.record_many(None, pdf_file, pdf_bytes, usage_log)
+                raise
+
+            print(f"Summary generated and published for {pdf_file}")
+            return True
 
-            # Format check LLM
-            format_check_llm = LLMHandler(
-                temperature=0.3,
-                max_tokens=6000,
-                top_p=0.95
-            )
+        else:
+            print("Failed to fetch PDF from S3.")
+            return False
 
-            output = format_check_llm.generate(
-                format_check_llm_system_prompt, 
-                f"Marpコンテンツは以下の通り：\n\n{output}"
-            )
 
-            # Write output to markdown file
-            os.makedirs(config.OUTPUT_DIR, exist_ok=True)
-            out_md_file = os.path.join(config.OUTPUT_DIR, f'{pdf_name}.md')
-            with open(out_md_file, 'w') as file:
-                file.write(output)
-
-            # Convert markdown to PDF
-            out_pdf_file = os.path.join(config.OUTPUT_DIR, f'{pdf_name}_slide.html')
-            convert_markdown_to_html(out_md_file, out_pdf_file)
-
-            s3_file_handler.upload_file(
-                out_pdf_file,
-                config.S3_BUCKET_NAME,
-                config.S3_UPLOAD_FOLDER_DIR,
-                f'{pdf_name}_slide.html'
-            )
+def enqueue_papers() -> list:
+    """
+    Enqueue every unprocessed PDF in the raw-files folder into the jobs table.
 
-            # Insert record into the database
-            SummaryPage.insert_or_update_record(
-                pdf_name, 
-                f'{config.CLOUDFRONT_URL}/{config.S3_UPLOAD_FOLDER_DIR}/{pdf_name}_slide.html', 
-                output
-            )
+    Returns:
+        list: The newly enqueued file names.
+    """
+    s3_file_handler = build_s3_file_handler()
+    pdf_file_lists = s3_file_handler.get_file_lists(config.S3_BUCKET_NAME, config.S3_DOWNLOAD_FOLDER_DIR)
+    pending = [
+        pdf_file for pdf_file in pdf_file_lists
+        if SummaryPage.get_record_by_title(os.path.splitext(pdf_file)[0]) is None
+    ]
+    enqueued = PaperJob.enqueue(pending)
+    print(f"Enqueued {len(enqueued)} of {len(pdf_file_lists)} PDFs")
+    return enqueued
 
-            print(f"Summary generated and saved to {config.OUTPUT_DIR}")
 
-            # Clean up files which includes file_stem in the name
-            file_stem = os.path.splitext(pdf_path)[0]
-            for fname in glob.glob(f'{file_stem}*'):
-                os.remove(fname)
+def run_worker(exit_when_idle: bool = False):
+    """
+    Run a worker that claims PDFs from the jobs table.
+
+    Several workers, on one or many machines, can share the same database.
+
+    Args:
+        exit_when_idle (bool): Return once the queue is empty instead of polling for new jobs.
+    """
+    s3_file_handler = build_s3_file_handler()
+    model_router = ModelRouter()
+
+    def process_job(pdf_file: str):
+        if not process_pdf_file(pdf_file, s3_file_handler, model_router):
+            raise RuntimeError(f"Failed to fetch {pdf_file} from S3")
+
+    worker = Worker(process_job)
+    worker.run(exit_when_idle=exit_when_idle)
+
+
+def _total_tokens(usage_log: List[dict]) -> int:
+    return sum(usage['input_tokens'] + usage['output_tokens'] for usage in usage_log)
+
+
+def run_batch(token_budget: Optional[int] = None, time_budget_seconds: Optional[float] = None):
+    """
+    Process the inbox cheapest-first within a token and time budget; papers that do not fit are left for the next run.
+
+    Args:
+        token_budget (Optional[int]): Maximum tokens for the batch. Defaults to BATCH_TOKEN_BUDGET.
+        time_budget_seconds (Optional[float]): Maximum wall time for the batch. Defaults to BATCH_TIME_BUDGET_SECONDS.
+
+    Returns:
+        BatchResult: Processed and deferred papers and the tokens used.
+    """
+    s3_file_handler = build_s3_file_handler()
+    model_router = ModelRouter()
+
+    pdf_sizes = s3_file_handler.get_file_sizes(config.S3_BUCKET_NAME, config.S3_DOWNLOAD_FOLDER_DIR, '.pdf')
+    pdf_sizes = {
+        pdf_file: size for pdf_file, size in pdf_sizes.items()
+        if SummaryPage.get_record_by_title(os.path.splitext(pdf_file)[0]) is None
+    }
+
+    rates = LLMUsage.cost_rates()
+    scheduler = BudgetScheduler(
+        token_budget=token_budget if token_budget is not None else config.BATCH_TOKEN_BUDGET,
+        time_budget_seconds=time_budget_seconds if time_budget_seconds is not None else config.BATCH_TIME_BUDGET_SECONDS,
+        tokens_per_pdf_byte=rates['tokens_per_pdf_byte'],
+        seconds_per_token=rates['seconds_per_token'],
+    )
+
+    def process(pdf_file: str) -> int:
+        usage_log = []
+        try:
+            fetched = process_pdf_file(pdf_file, s3_file_handler, model_router, usage_log=usage_log)
+        except Exception as e:
+            raise PaperFailed(str(e), _total_tokens(usage_log)) from e
+        if not fetched:
+            raise PaperFailed(f"Failed to fetch {pdf_file} from S3")
+        return _total_tokens(usage_log)
+
+    result = scheduler.run(pdf_sizes, process)
+    print(
+        f"Processed {len(result.processed)} PDFs using {result.tokens_used} tokens in {result.elapsed_seconds:.0f}s; "
+        f"failed {len(result.failed)}; "
+        f"deferred {len(result.deferred)}" + (f" ({result.stop_reason})" if result.stop_reason else "")
+    )
+    return result
+
+
+def run_watch(poll_interval: Optional[float] = None, workers: Optional[int] = None):
+    """
+    Run as a daemon that processes new uploads as they arrive instead of scanning the inbox once.
+
+    Args:
+        poll_interval (Optional[float]): Seconds between polls. Defaults to WATCH_POLL_INTERVAL.
+        workers (Optional[int]): PDFs processed concurrently. Defaults to WATCH_WORKERS.
+    """
+    s3_file_handler = build_s3_file_handler()
+    model_router = ModelRouter()
+
+    if config.WATCH_SOURCE == 'queue':
+        source = LocalQueueSource(config.WATCH_QUEUE_DIR, config.S3_DOWNLOAD_FOLDER_DIR)
+    else:
+        source = S3PollingSource(s3_file_handler, config.S3_BUCKET_NAME, config.S3_DOWNLOAD_FOLDER_DIR)
+
+    def process(pdf_file: str):
+        if not process_pdf_file(pdf_file, s3_file_handler, model_router):
+            raise RuntimeError(f"Failed to fetch {pdf_file} from S3")
+
+    watcher = InboxWatcher(source, process, poll_interval=poll_interval, workers=workers)
+    # Finish the running jobs on SIGTERM/SIGINT instead of abandoning them mid-upload
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: watcher.stop())
+    watcher.run()
 
-        else:
-            print("Failed to fetch PDF from S3.")
 
 def pdf_fetcher(arxiv_url):
 
-    arxiv_id = arxiv_url.split('/')[-1]
-    if 'v' in arxiv_id: 
-        arxiv_id = arxiv_id.split('v')[0]
-        
+    # Strip the version and extension ("2401.01234v2.pdf" -> "2401.01234")
+    arxiv_id = re.sub(r'(v\d+)?(\.pdf)?$', '', arxiv_url.rstrip('/').split('/')[-1])
+
     client = arxiv.Client()
     search = arxiv.Search(
         query=f"id:{arxiv_id}",
@@ -201,5 +388,73 @@ def process_pdf():
 def get_summary_pages():
     print("TBA")
 
+@app.route('/api/usage', methods=['GET'])
+def get_usage_report():
+    days = request.args.get('days', type=int)
+    group_by = request.args.get('group_by', 'model_id')
+    since = datetime.now() - timedelta(days=days) if days else None
+    try:
+        return jsonify(LLMUsage.report(since=since, group_by=group_by))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/metrics/db_pool', methods=['GET'])
+def get_db_pool_metrics():
+    return jsonify(get_pool_metrics())
+
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Paper presentation service")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="serve",
+        choices=["serve", "run", "enqueue", "worker", "rebuild", "batch", "watch", "usage-report"],
+        help="serve: start the API (default), run: process the inbox once in this process, "
+             "enqueue: add unprocessed PDFs to the jobs table, worker: process jobs from the jobs table, "
+             "rebuild: re-render every deck from the stored markdown, "
+             "batch: process the inbox cheapest-first within a token/time budget, "
+             "watch: keep running and process new uploads as they arrive, "
+             "usage-report: print token usage and latency totals",
+    )
+    parser.add_argument("--exit-when-idle", action="store_true", help="worker: exit once the queue is empty")
+    parser.add_argument("--dry-run", action="store_true", help="rebuild: report changed decks without uploading")
+    parser.add_argument("--resume", action="store_true", help="rebuild: continue from the last checkpoint")
+    parser.add_argument("--batch-size", type=int, help="rebuild: decks per renderer run")
+    parser.add_argument("--workers", type=int,
+                        help="rebuild: batches rendered in parallel, watch: PDFs processed in parallel")
+    parser.add_argument("--poll-interval", type=float, help="watch: seconds between polls")
+    parser.add_argument("--token-budget", type=int, help="batch: maximum tokens for the run")
+    parser.add_argument("--time-budget", type=float, help="batch: maximum seconds for the run")
+    parser.add_argument("--days", type=int, help="usage-report: only include the last N days")
+    parser.add_argument("--group-by", default="model_id", choices=["model_id", "stage", "tier", "day"],
+                        help="usage-report: grouping")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        logging.basicConfig(level=logging.INFO)
+        main()
+    elif args.command == "enqueue":
+        enqueue_papers()
+    elif args.command == "worker":
+        logging.basicConfig(level=logging.INFO)
+        run_worker(exit_when_idle=args.exit_when_idle)
+    elif args.command == "rebuild":
+        logging.basicConfig(level=logging.INFO)
+        totals = DeckRebuilder(build_s3_file_handler(), dry_run=args.dry_run).run(
+            batch_size=args.batch_size,
+            workers=args.workers,
+            resume=args.resume,
+        )
+        print(f"Rebuild finished: {totals}")
+    elif args.command == "batch":
+        logging.basicConfig(level=logging.INFO)
+        run_batch(token_budget=args.token_budget, time_budget_seconds=args.time_budget)
+    elif args.command == "watch":
+        logging.basicConfig(level=logging.INFO)
+        run_watch(poll_interval=args.poll_interval, workers=args.workers)
+    elif args.command == "usage-report":
+        since = datetime.now() - timedelta(days=args.days) if args.days else None
+        for row in LLMUsage.report(since=since, group_by=args.group_by):
+            print(json.dumps(row, ensure_ascii=False))
+    else:
+        app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
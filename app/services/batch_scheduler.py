@@ -0,0 +1,125 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from app.config import config
+
+
+@dataclass
+class PlannedPaper:
+    object_key: str
+    pdf_bytes: int
+    estimated_tokens: int
+    estimated_seconds: Optional[float] = None
+
+
+class PaperFailed(Exception):
+    """Raised by a batch process function for a paper that failed after spending ``tokens_used`` tokens."""
+
+    def __init__(self, message: str, tokens_used: int = 0):
+        super().__init__(message)
+        self.tokens_used = tokens_used
+
+
+@dataclass
+class BatchResult:
+    processed: List[str] = field(default_factory=list)
+    deferred: List[str] = field(default_factory=list)
+    # {object_key: error} of papers that raised; the batch continues with the next paper
+    failed: Dict[str, str] = field(default_factory=dict)
+    tokens_used: int = 0
+    elapsed_seconds: float = 0.0
+    stop_reason: Optional[str] = None
+
+
+class BudgetScheduler:
+    """Order papers by estimated token cost and stop once a token or time budget would be exceeded."""
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        time_budget_seconds: Optional[float] = None,
+        tokens_per_pdf_byte: Optional[float] = None,
+        seconds_per_token: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the BudgetScheduler.
+
+        Args:
+            token_budget (Optional[int]): Maximum tokens (input + output) for the batch. None or 0 means unlimited.
+            time_budget_seconds (Optional[float]): Maximum wall time for the batch. None or 0 means unlimited.
+            tokens_per_pdf_byte (Optional[float]): Cost estimate rate. Defaults to ESTIMATED_TOKENS_PER_PDF_BYTE.
+            seconds_per_token (Optional[float]): Latency estimate rate; without it only elapsed time is checked.
+            clock (Callable[[], float]): Time source, replaceable in tests.
+        """
+        self.token_budget = token_budget or None
+        self.time_budget_seconds = time_budget_seconds or None
+        self.tokens_per_pdf_byte = tokens_per_pdf_byte or config.ESTIMATED_TOKENS_PER_PDF_BYTE
+        self.seconds_per_token = seconds_per_token
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+    def plan(self, pdf_sizes: Dict[str, int]) -> List[PlannedPaper]:
+        """
+        Estimate the cost of each paper and order them cheapest first.
+
+        Running the cheapest papers first fits the most papers into a budget.
+
+        Args:
+            pdf_sizes (Dict[str, int]): ``{object_key: size_in_bytes}``.
+
+        Returns:
+            List[PlannedPaper]: The papers in processing order.
+        """
+        planned = []
+        for object_key, pdf_bytes in pdf_sizes.items():
+            estimated_tokens = int(pdf_bytes * self.tokens_per_pdf_byte)
+            estimated_seconds = estimated_tokens * self.seconds_per_token if self.seconds_per_token else None
+            planned.append(PlannedPaper(object_key, pdf_bytes, estimated_tokens, estimated_seconds))
+        return sorted(planned, key=lambda paper: (paper.estimated_tokens, paper.object_key))
+
+    def run(self, pdf_sizes: Dict[str, int], process_func: Callable[[str], int]) -> BatchResult:
+        """
+        Process papers in plan order until the budget is reached; the rest is deferred to a later run.
+
+        A paper that raises is recorded as failed and the batch moves on. Raise ``PaperFailed``
+        to report the tokens the paper spent before failing.
+
+        Args:
+            pdf_sizes (Dict[str, int]): ``{object_key: size_in_bytes}``.
+            process_func (Callable[[str], int]): Processes one paper and returns the tokens it used.
+
+        Returns:
+            BatchResult: Processed, failed and deferred papers, tokens used and why the batch stopped.
+        """
+        result = BatchResult()
+        start = self.clock()
+        planned = self.plan(pdf_sizes)
+        for index, paper in enumerate(planned):
+            elapsed = self.clock() - start
+            stop_reason = None
+            if self.token_budget and result.tokens_used + paper.estimated_tokens > self.token_budget:
+                stop_reason = (f"token budget: {result.tokens_used} used + ~{paper.estimated_tokens} "
+                               f"estimated > {self.token_budget}")
+            elif self.time_budget_seconds and elapsed + (paper.estimated_seconds or 0) > self.time_budget_seconds:
+                stop_reason = f"time budget: {elapsed:.0f}s elapsed of {self.time_budget_seconds:.0f}s"
+            if stop_reason:
+                # Papers are sorted by estimated cost, so none of the remaining ones fit either
+                result.deferred = [remaining.object_key for remaining in planned[index:]]
+                result.stop_reason = stop_reason
+                self.logger.info(f"Deferring {len(result.deferred)} papers ({stop_reason})")
+                break
+
+            try:
+                result.tokens_used += process_func(paper.object_key)
+            except Exception as e:
+                self.logger.error(f"Failed to process {paper.object_key}: {e}")
+                result.failed[paper.object_key] = str(e)
+                result.tokens_used += getattr(e, 'tokens_used', 0)
+                continue
+            result.processed.append(paper.object_key)
+
+        result.elapsed_seconds = self.clock() - start
+        return result
@@ -0,0 +1,362 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+from app.services.read_pdf import read_pdf_pages
+
+
+# Canonical section names, keyed by the heading prefixes that map to them
+SECTION_KEYWORDS = {
+    'abstract': ('abstract',),
+    'introduction': ('introduction',),
+    'related_work': ('related work', 'background', 'preliminaries', 'prior work'),
+    'method': ('method', 'methods', 'methodology', 'approach', 'our approach', 'proposed method', 'model'),
+    'results': ('experiment', 'experiments', 'experimental', 'evaluation', 'results'),
+    'discussion': ('discussion', 'limitations', 'analysis'),
+    'conclusion': ('conclusion', 'conclusions', 'concluding remarks', 'summary and conclusion'),
+    'acknowledgments': ('acknowledgment', 'acknowledgments', 'acknowledgement', 'acknowledgements'),
+    'references': ('references', 'bibliography', 'literature cited'),
+    'appendix': ('appendix', 'appendices', 'supplementary', 'supplemental'),
+}
+
+# Optional numbering ("3", "3.1", "III.", "A") followed by a short heading
+HEADING_PATTERN = re.compile(
+    r'^\s*(?:(?:\d+(?:\.\d+)*|[IVX]+|[A-Z])\.?\s+)?(?P<title>[A-Za-z][A-Za-z &\-]{2,60}?)\s*(?P<rest>[.:—–-]\s*.*)?$'
+)
+# Lettered appendix headings ("A Proofs", "B.1 Additional Results") that follow the references
+APPENDIX_HEADING_PATTERN = re.compile(r'^\s*[A-Z](?:\.\d+)*\.?\s+[A-Z][A-Za-z &\-]{2,60}$')
+NUMBERED_HEADING_PATTERN = re.compile(r'^\s*(?:\d+(?:\.\d+)*|[IVX]+|[A-Z])\.?\s+\S')
+HYPHENATION_PATTERN = re.compile(r'(\w)-\n(\w)')
+PAGE_NUMBER_PATTERN = re.compile(r'^\s*(?:page\s*)?\d+(?:\s*(?:/|of)\s*\d+)?\s*$', re.IGNORECASE)
+
+# Lines at the top/bottom of a page that are checked for repeated headers/footers
+FURNITURE_LINES = 3
+# Bibliography entries: "[12] ...", "12. Author ...", "Vaswani, A., ..." or any line with a year
+CITATION_PATTERN = re.compile(r"^\s*(?:\[\d+\]|\d+\.\s+[A-Z]|[A-Z][A-Za-z'\-]+,\s+(?:[A-Z]\.\s*)+)|\b(?:19|20)\d{2}[a-z]?\b")
+# Lines after a references heading that are checked for citations
+CITATION_SAMPLE_LINES = 5
+# Sections that must come before the references heading that starts the back matter
+BODY_SECTIONS = ('introduction', 'related_work', 'method', 'results', 'discussion', 'conclusion')
+SENTENCE_ENDINGS = ('.', '!', '?', ':', ';')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the number of LLM tokens in a text (about 4 characters per token).
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated token count.
+    """
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class Section:
+    name: str
+    heading: str
+    text: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+@dataclass
+class ExtractedPaper:
+    sections: List[Section] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return '\n\n'.join(section.text for section in self.sections)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    def section_names(self) -> List[str]:
+        return [section.name for section in self.sections]
+
+    def prompt_text(self, excluded_sections: Iterable[str]) -> str:
+        """
+        Join the sections that should reach the prompt.
+
+        Args:
+            excluded_sections (Iterable[str]): Canonical names of sections to drop.
+
+        Returns:
+            str: The text of the remaining sections. Falls back to the full text if nothing is left.
+        """
+        excluded = set(excluded_sections)
+        text = '\n\n'.join(section.text for section in self.sections if section.name not in excluded)
+        return text if text.strip() else self.text
+
+    def report(self, excluded_sections: Iterable[str]) -> dict:
+        """
+        Summarize how many tokens the section policy saves.
+
+        Args:
+            excluded_sections (Iterable[str]): Canonical names of sections to drop.
+
+        Returns:
+            dict: Original and prompt token estimates, tokens saved and the dropped sections.
+        """
+        excluded = set(excluded_sections)
+        original_tokens = self.tokens
+        prompt_tokens = estimate_tokens(self.prompt_text(excluded))
+        return {
+            'sections': self.section_names(),
+            'dropped_sections': [name for name in self.section_names() if name in excluded],
+            'original_tokens': original_tokens,
+            'prompt_tokens': prompt_tokens,
+            'saved_tokens': original_tokens - prompt_tokens,
+        }
+
+
+def _normalize_furniture_line(line: str) -> str:
+    # Page numbers change from page to page, so compare lines with digits masked
+    return re.sub(r'\d+', '#', line.strip().lower())
+
+
+def strip_page_furniture(pages: List[str], min_ratio: float = 0.5) -> List[str]:
+    """
+    Remove running headers/footers and bare page numbers from each page.
+
+    A line near the top or bottom of a page counts as furniture when it repeats
+    (ignoring digits) on at least ``min_ratio`` of the pages.
+
+    Args:
+        pages (List[str]): The text of each page.
+        min_ratio (float): Fraction of pages a line must appear on to be removed.
+
+    Returns:
+        List[str]: The cleaned text of each page.
+    """
+    page_lines = [page.splitlines() for page in pages]
+    counts = Counter()
+    for lines in page_lines:
+        edges = lines[:FURNITURE_LINES] + lines[-FURNITURE_LINES:]
+        counts.update({_normalize_furniture_line(line) for line in edges if line.strip()})
+
+    threshold = max(2, int(len(pages) * min_ratio))
+    repeated = {line for line, count in counts.items() if count >= threshold}
+
+    cleaned = []
+    for lines in page_lines:
+        kept = []
+        for index, line in enumerate(lines):
+            at_edge = index < FURNITURE_LINES or index >= len(lines) - FURNITURE_LINES
+            if at_edge and (PAGE_NUMBER_PATTERN.match(line) or _normalize_furniture_line(line) in repeated):
+                continue
+            kept.append(line)
+        cleaned.append('\n'.join(kept))
+    return cleaned
+
+
+def rejoin_hyphenation(text: str) -> str:
+    """
+    Rejoin words split by a hyphen at a line break ("summari-\\nzation" -> "summarization").
+
+    Args:
+        text (str): The text to fix.
+
+    Returns:
+        str: The text with hyphenated line breaks removed.
+    """
+    return HYPHENATION_PATTERN.sub(r'\1\2', text)
+
+
+def classify_heading(line: str) -> Optional[tuple]:
+    """
+    Match a line against the known section headings.
+
+    A line that is exactly a known heading always matches. Longer headings
+    ("Experimental Results", "4.2 Results on ImageNet") must be numbered, Title Case
+    or upper case, so body sentences that start with a keyword are not split on.
+
+    Args:
+        line (str): A single line of text.
+
+    Returns:
+        Optional[tuple]: ``(section_name, heading, rest_of_line)`` if the line is a heading, None otherwise.
+    """
+    match = HEADING_PATTERN.match(line)
+    if not match:
+        return None
+    raw_title = match.group('title').strip()
+    title = ' '.join(raw_title.lower().split())
+    rest = (match.group('rest') or '').lstrip('.:—–- ').strip()
+    heading = line[:match.start('rest')].strip() if match.group('rest') else line.strip()
+    numbered = match.start('title') > len(line) - len(line.lstrip())
+    title_case = raw_title.isupper() or all(word[0].isupper() for word in raw_title.split())
+
+    for name, keywords in SECTION_KEYWORDS.items():
+        exact = title in keywords
+        prefixed = any(title.startswith(f'{keyword} ') for keyword in keywords)
+        if not exact and not (prefixed and (numbered or title_case) and len(title.split()) <= 6):
+            continue
+        # Only the abstract is commonly run into its first sentence ("Abstract. We ...")
+        if rest and name != 'abstract':
+            return None
+        return name, heading, rest
+    return None
+
+
+def _has_heading_layout(line: str, previous_line: str) -> bool:
+    """
+    Check whether a bare one-word heading ("Model", "Supplementary") is laid out like one.
+
+    Such words also occur alone as table cells or figure labels, so they only count as a
+    heading when numbered, in upper case, or starting a new paragraph.
+
+    Args:
+        line (str): The candidate heading line.
+        previous_line (str): The line before it.
+
+    Returns:
+        bool: True if the line looks like a heading.
+    """
+    stripped = line.strip()
+    if NUMBERED_HEADING_PATTERN.match(line) or (stripped.isupper() and len(stripped) > 3):
+        return True
+    previous = previous_line.strip()
+    return not previous or previous.endswith(SENTENCE_ENDINGS)
+
+
+def _is_followed_by_citations(text_lines: List[str], headings: List[Optional[tuple]], index: int) -> bool:
+    """
+    Check whether the lines after a references heading look like bibliography entries.
+
+    Args:
+        text_lines (List[str]): The lines of the paper text.
+        headings (List[Optional[tuple]]): ``classify_heading`` result per line.
+        index (int): Index of the references heading.
+
+    Returns:
+        bool: True if at least half of the first few lines before the next heading are citation-like.
+    """
+    sample = []
+    for line, heading in zip(text_lines[index + 1:], headings[index + 1:]):
+        if heading is not None or len(sample) >= CITATION_SAMPLE_LINES:
+            break
+        if line.strip():
+            sample.append(line)
+    cited = sum(1 for line in sample if CITATION_PATTERN.search(line))
+    return bool(sample) and cited * 2 >= len(sample)
+
+
+def _find_headings(text_lines: List[str]) -> List[Optional[tuple]]:
+    """
+    Classify every line and decide where the back matter starts.
+
+    The back matter starts at the first references heading that comes after a body
+    section and is followed by citation-like lines. Other references headings are
+    treated as body text.
+
+    Args:
+        text_lines (List[str]): The lines of the paper text.
+
+    Returns:
+        List[Optional[tuple]]: ``classify_heading`` result per line, with back matter headings renamed.
+    """
+    headings: List[Optional[tuple]] = []
+    previous_line = ''
+    for line in text_lines:
+        heading = classify_heading(line)
+        if heading is not None and not heading[2] and len(heading[1].split()) == 1:
+            if not _has_heading_layout(line, previous_line):
+                heading = None
+        headings.append(heading)
+        if line.strip():
+            previous_line = line
+
+    back_matter_start = None
+    seen_body = False
+    for index, heading in enumerate(headings):
+        if heading is None:
+            continue
+        if heading[0] in BODY_SECTIONS:
+            seen_body = True
+        elif heading[0] == 'references' and seen_body and _is_followed_by_citations(text_lines, headings, index):
+            back_matter_start = index
+            break
+
+    for index, heading in enumerate(headings):
+        in_back_matter = back_matter_start is not None and index >= back_matter_start
+        if heading is None:
+            # Lettered appendix headings ("A Proofs") are only recognized after the references
+            if in_back_matter and index > back_matter_start and APPENDIX_HEADING_PATTERN.match(text_lines[index]):
+                headings[index] = ('appendix', text_lines[index].strip(), '')
+            continue
+        name, heading_line, rest = heading
+        if name in ('references', 'appendix') and not in_back_matter:
+            headings[index] = None
+        elif in_back_matter and index > back_matter_start and name != 'acknowledgments':
+            headings[index] = ('appendix', heading_line, rest)
+    return headings
+
+
+def split_sections(text: str) -> List[Section]:
+    """
+    Split paper text into canonical sections.
+
+    Text before the first recognized heading (title, authors) is kept as ``front_matter``.
+    Headings after the references (other than acknowledgments) are treated as appendix material.
+
+    Args:
+        text (str): The cleaned paper text.
+
+    Returns:
+        List[Section]: The sections in document order.
+    """
+    sections: List[Section] = []
+    current = Section(name='front_matter', heading='', text='')
+    lines: List[str] = []
+    text_lines = text.splitlines()
+
+    for line, heading in zip(text_lines, _find_headings(text_lines)):
+        if heading is None:
+            lines.append(line)
+            continue
+        name, heading_line, rest = heading
+        current.text = '\n'.join(lines).strip()
+        if current.text or current.heading:
+            sections.append(current)
+        current = Section(name=name, heading=heading_line, text='')
+        lines = [heading_line, rest] if rest else [heading_line]
+
+    current.text = '\n'.join(lines).strip()
+    if current.text:
+        sections.append(current)
+    return sections
+
+
+def extract_paper_pages(pages: List[str]) -> ExtractedPaper:
+    """
+    Build a structured paper from raw page texts.
+
+    Args:
+        pages (List[str]): The text of each page.
+
+    Returns:
+        ExtractedPaper: The paper split into sections.
+    """
+    text = '\n'.join(strip_page_furniture(pages))
+    text = rejoin_hyphenation(text)
+    return ExtractedPaper(sections=split_sections(text))
+
+
+def extract_paper(file_path: str) -> ExtractedPaper:
+    """
+    Read a PDF file and split its text into sections.
+
+    Args:
+        file_path (str): The path to the PDF file.
+
+    Returns:
+        ExtractedPaper: The paper split into sections.
+    """
+    return extract_paper_pages(read_pdf_pages(file_path))
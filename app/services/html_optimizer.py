@@ -0,0 +1,261 @@
+import gzip
+import hashlib
+import logging
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config import config
+from app.services.s3_file_handler import S3FileHandler
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+# Blocks whose whitespace is significant or that are handled separately
+PROTECTED_PATTERN = re.compile(r'<(pre|textarea|script|style)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+COMMENT_PATTERN = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+INLINE_ASSET_PATTERN = re.compile(
+    r'<(?P<tag>style|script)(?P<attrs>[^>]*)>(?P<body>.*?)</(?P=tag)\s*>', re.IGNORECASE | re.DOTALL
+)
+CSS_COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+CSS_PUNCTUATION_PATTERN = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(css: str) -> str:
+    """
+    Remove comments and redundant whitespace from CSS.
+
+    Whitespace around ``:`` is kept because it is significant in selectors (``a :hover``).
+
+    Args:
+        css (str): The CSS to minify.
+
+    Returns:
+        str: The minified CSS.
+    """
+    css = CSS_COMMENT_PATTERN.sub('', css)
+    css = WHITESPACE_PATTERN.sub(' ', css)
+    css = CSS_PUNCTUATION_PATTERN.sub(r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_html(html: str) -> str:
+    """
+    Remove comments and collapse whitespace in HTML.
+
+    Runs of whitespace become a single space so inline spacing is preserved.
+    ``<pre>``, ``<textarea>`` and ``<script>`` are left untouched; ``<style>`` bodies are CSS-minified.
+
+    Args:
+        html (str): The HTML to minify.
+
+    Returns:
+        str: The minified HTML.
+    """
+    parts: List[str] = []
+    position = 0
+    for match in PROTECTED_PATTERN.finditer(html):
+        parts.append(WHITESPACE_PATTERN.sub(' ', COMMENT_PATTERN.sub('', html[position:match.start()])))
+        block = match.group(0)
+        if match.group(1).lower() == 'style':
+            open_end = block.index('>') + 1
+            close_start = block.lower().rindex('</style')
+            block = block[:open_end] + minify_css(block[open_end:close_start]) + block[close_start:]
+        parts.append(block)
+        position = match.end()
+    parts.append(WHITESPACE_PATTERN.sub(' ', COMMENT_PATTERN.sub('', html[position:])))
+    return ''.join(parts).strip()
+
+
+def extract_shared_assets(
+    html: str,
+    asset_url: Callable[[str], str],
+    min_size: int,
+) -> Tuple[str, Dict[str, Tuple[str, bytes]]]:
+    """
+    Move large inline ``<style>``/``<script>`` blocks (theme CSS, marp runtime) into content-hashed assets.
+
+    Identical blocks in different decks hash to the same asset, so each is stored and cached once.
+
+    Args:
+        html (str): The deck HTML.
+        asset_url (Callable[[str], str]): Maps an asset file name (``<sha256>.css``) to its public URL.
+        min_size (int): Blocks smaller than this many bytes stay inline.
+
+    Returns:
+        Tuple[str, Dict[str, Tuple[str, bytes]]]: The rewritten HTML and ``{file_name: (content_type, body)}``.
+    """
+    assets: Dict[str, Tuple[str, bytes]] = {}
+
+    def replace(match: re.Match) -> str:
+        tag = match.group('tag').lower()
+        attrs = match.group('attrs')
+        body = match.group('body').encode('utf-8')
+        # Scripts that already load from a URL have no inline body to move
+        if len(body) < min_size or re.search(r'\bsrc\s*=', attrs, re.IGNORECASE):
+            return match.group(0)
+        extension, content_type = ('css', 'text/css') if tag == 'style' else ('js', 'application/javascript')
+        file_name = f"{hashlib.sha256(body).hexdigest()}.{extension}"
+        assets[file_name] = (f'{content_type}; charset=utf-8', body)
+        if tag == 'style':
+            return f'<link rel="stylesheet" href="{asset_url(file_name)}">'
+        return f'<script{attrs} src="{asset_url(file_name)}"></script>'
+
+    return INLINE_ASSET_PATTERN.sub(replace, html), assets
+
+
+def compress_variants(data: bytes) -> Dict[str, bytes]:
+    """
+    Pre-compress data with every enabled encoding.
+
+    Args:
+        data (bytes): The data to compress.
+
+    Returns:
+        Dict[str, bytes]: ``{content_encoding: body}``; gzip is always present, br when enabled and installed.
+    """
+    variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    if config.SLIDE_HTML_BROTLI and brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    return variants
+
+
+def _upload_compressed(
+    s3_file_handler: S3FileHandler,
+    data: bytes,
+    bucket_name: str,
+    bucket_folder_dir: str,
+    object_key: str,
+    content_type: str,
+    cache_control: str,
+    overwrite: bool = True,
+) -> Optional[Dict[str, int]]:
+    # The object itself is gzip-encoded, which every browser accepts. With SLIDE_HTML_BROTLI a
+    # brotli copy is stored next to it as "<key>.br" for an edge function to serve.
+    # Returns None as soon as an upload fails.
+    sizes = {}
+    for encoding, body in compress_variants(data).items():
+        key = object_key if encoding == 'gzip' else f'{object_key}.{encoding}'
+        uploaded = s3_file_handler.upload_bytes(
+            body,
+            bucket_name,
+            bucket_folder_dir,
+            key,
+            content_type=content_type,
+            content_encoding=encoding,
+            cache_control=cache_control,
+            overwrite=overwrite,
+        )
+        if not uploaded:
+            return None
+        sizes[encoding] = len(body)
+    return sizes
+
+
+def publish_slide_html(
+    s3_file_handler: S3FileHandler,
+    html_path: str,
+    bucket_name: str,
+    bucket_folder_dir: str,
+    object_key: str,
+) -> Optional[Dict[str, int]]:
+    """
+    Minify a rendered deck, move shared theme/runtime blocks to hashed assets and upload everything pre-compressed.
+
+    Args:
+        s3_file_handler (S3FileHandler): Handler used for the uploads.
+        html_path (str): Path to the HTML rendered by marp.
+        bucket_name (str): The name of the S3 bucket.
+        bucket_folder_dir (str): The directory in the S3 bucket for the deck.
+        object_key (str): The key of the deck in the S3 bucket.
+
+    Returns:
+        Optional[Dict[str, int]]: Byte counts of the raw, minified and compressed deck and the number of assets,
+            or None if an asset or the deck failed to upload.
+    """
+    with open(html_path, 'r', encoding='utf-8') as file:
+        raw_html = file.read()
+
+    html = minify_html(raw_html)
+    html, assets = extract_shared_assets(
+        html,
+        lambda file_name: f'{config.CLOUDFRONT_URL}/{config.S3_ASSET_FOLDER_DIR}/{file_name}',
+        config.SLIDE_ASSET_MIN_BYTES,
+    )
+
+    for file_name, (content_type, body) in assets.items():
+        # Content-hashed names never change content, so existing assets are left alone
+        if s3_file_handler.object_exists(bucket_name, config.S3_ASSET_FOLDER_DIR, file_name):
+            continue
+        uploaded = _upload_compressed(
+            s3_file_handler, body, bucket_name, config.S3_ASSET_FOLDER_DIR, file_name,
+            content_type, config.SLIDE_ASSET_CACHE_CONTROL, overwrite=False,
+        )
+        # Another worker may have uploaded the same asset in the meantime
+        if uploaded is None and not s3_file_handler.object_exists(bucket_name, config.S3_ASSET_FOLDER_DIR, file_name):
+            logger.error(f"Failed to upload asset {file_name} for {object_key}")
+            return None
+
+    data = html.encode('utf-8')
+    sizes = _upload_compressed(
+        s3_file_handler, data, bucket_name, bucket_folder_dir, object_key,
+        'text/html; charset=utf-8', config.SLIDE_CACHE_CONTROL,
+    )
+    if sizes is None:
+        logger.error(f"Failed to upload {object_key}")
+        return None
+    stats = {
+        'raw_bytes': len(raw_html.encode('utf-8')),
+        'minified_bytes': len(data),
+        'assets': len(assets),
+    }
+    stats.update({f'{encoding}_bytes': size for encoding, size in sizes.items()})
+    logger.info(f"Published {object_key}: {stats}")
+    return stats
+
+
+def html_file_hash(html_path: str) -> str:
+    """
+    Hash a rendered deck the way it is published, so unchanged decks can be skipped.
+
+    Args:
+        html_path (str): Path to the HTML rendered by marp.
+
+    Returns:
+        str: The sha256 hex digest of the (minified, when enabled) HTML.
+    """
+    with open(html_path, 'r', encoding='utf-8') as file:
+        html = file.read()
+    if config.SLIDE_HTML_OPTIMIZE:
+        html = minify_html(html)
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+def publish_slide(
+    s3_file_handler: S3FileHandler,
+    html_path: str,
+    bucket_name: str,
+    bucket_folder_dir: str,
+    object_key: str,
+) -> bool:
+    """
+    Upload a rendered deck, optimized unless SLIDE_HTML_OPTIMIZE is off.
+
+    Args:
+        s3_file_handler (S3FileHandler): Handler used for the uploads.
+        html_path (str): Path to the HTML rendered by marp.
+        bucket_name (str): The name of the S3 bucket.
+        bucket_folder_dir (str): The directory in the S3 bucket for the deck.
+        object_key (str): The key of the deck in the S3 bucket.
+
+    Returns:
+        bool: True if the deck was uploaded.
+    """
+    if config.SLIDE_HTML_OPTIMIZE:
+        return publish_slide_html(s3_file_handler, html_path, bucket_name, bucket_folder_dir, object_key) is not None
+    return s3_file_handler.upload_file(html_path, bucket_name, bucket_folder_dir, object_key)
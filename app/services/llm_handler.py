@@ -1,16 +1,21 @@
+import time
 import boto3
 from langchain.schema import SystemMessage, HumanMessage
 from langchain_community.chat_models import BedrockChat
 
+from typing import Optional
+
 from app.config import config
 
 class LLMHandler():
 
-    def __init__(self, temperature: float, max_tokens: int, top_p: float):
+    def __init__(self, temperature: float, max_tokens: int, top_p: float, model_id: Optional[str] = None):
         bedrock_client = self.initialize_bedrock_client()
+        self.model_id = model_id or config.MODEL_NAME
+        self.last_usage = None
         self.llm = BedrockChat(
             client=bedrock_client,
-            model_id=config.MODEL_NAME,
+            model_id=self.model_id,
             model_kwargs={
                 "temperature": temperature,
                 "max_tokens": max_tokens,
@@ -40,6 +45,17 @@ class LLMHandler():
             HumanMessage(content=custom_prompt)
         ]
 
-        # LLMを直接呼び出し
-        response = self.llm.invoke(messages)
-        return response.content
+        # LLMを呼び出し、使用トークン数とレイテンシを記録
+        # (invokeはusageを返さないため、llm_outputを含むgenerateを使う)
+        start = time.perf_counter()
+        result = self.llm.generate([messages])
+        latency = time.perf_counter() - start
+
+        usage = (result.llm_output or {}).get("usage") or {}
+        self.last_usage = {
+            "model_id": self.model_id,
+            "input_tokens": int(usage.get("prompt_tokens", 0)),
+            "output_tokens": int(usage.get("completion_tokens", 0)),
+            "latency_seconds": latency,
+        }
+        return result.generations[0][0].text
@@ -1,4 +1,7 @@
 import os
+import subprocess
+
+from app.config import config
 
 
 def convert_markdown_to_html(
@@ -23,4 +26,30 @@ def convert_markdown_to_html(
             -o {output_path}
     """
 
-    os.system(command)
\ No newline at end of file
+    os.system(command)
+
+
+def convert_markdown_dir_to_html(
+        input_dir: str,
+        output_dir: str,
+    ) -> bool:
+    """Convert every Markdown file in a directory to HTML with a single marp run.
+
+    Starting marp once per batch avoids paying the node startup cost for every deck.
+
+    Args:
+        input_dir (str): Directory containing the Markdown files.
+        output_dir (str): Directory to write the HTML files to (same base names).
+
+    Returns:
+        bool: True if marp exited successfully.
+    """
+    command = [
+        "npx", "@marp-team/marp-cli",
+        "--input-dir", input_dir,
+        "--theme", config.CSS_TEMPLATE_PATH,
+        "--allow-local-files",
+        "--html",
+        "-o", output_dir,
+    ]
+    return subprocess.run(command).returncode == 0
@@ -0,0 +1,152 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+from app.config import config
+from app.services.llm_handler import LLMHandler
+
+
+@dataclass
+class ModelTier:
+    name: str
+    model_id: str
+    max_tokens: int
+    # Largest prompt (in estimated tokens) this tier is used for; None means no limit
+    max_input_tokens: Optional[int] = None
+
+
+@dataclass
+class RoutingDecision:
+    tier: ModelTier
+    input_tokens: int
+    reason: str
+
+
+def default_tiers() -> List[ModelTier]:
+    """Build the summarization tiers from the config, cheapest first."""
+    return [
+        ModelTier('fast', config.FAST_MODEL_NAME, config.FAST_MAX_TOKENS, config.FAST_TIER_MAX_INPUT_TOKENS),
+        ModelTier('standard', config.MODEL_NAME, config.MAX_TOKENS, config.LARGE_TIER_MIN_INPUT_TOKENS),
+        ModelTier('large', config.LARGE_MODEL_NAME, config.LARGE_MAX_TOKENS, None),
+    ]
+
+
+def default_format_check_tier() -> ModelTier:
+    """Build the tier used for the format-check pass from the config."""
+    return ModelTier('format_check', config.FORMAT_CHECK_MODEL_NAME, config.FORMAT_CHECK_MAX_TOKENS)
+
+
+class ModelRouter:
+    """Pick a model tier and output budget per paper and run the LLM passes on it."""
+
+    def __init__(
+        self,
+        tiers: Optional[List[ModelTier]] = None,
+        format_check_tier: Optional[ModelTier] = None,
+        handler_factory: Callable[..., LLMHandler] = LLMHandler,
+    ):
+        """
+        Initialize the ModelRouter.
+
+        Args:
+            tiers (Optional[List[ModelTier]]): Summarization tiers ordered cheapest first. Defaults to the config tiers.
+            format_check_tier (Optional[ModelTier]): Tier for the format-check pass. Defaults to the config tier.
+            handler_factory (Callable[..., LLMHandler]): Builds a handler from
+                ``temperature, max_tokens, top_p, model_id``. Pass a fake to test without Bedrock.
+        """
+        self.tiers = tiers or default_tiers()
+        self.format_check_tier = format_check_tier or default_format_check_tier()
+        self.handler_factory = handler_factory
+        self.logger = logging.getLogger(__name__)
+
+    def route(self, input_tokens: int, section_names: Sequence[str] = ()) -> RoutingDecision:
+        """
+        Choose the summarization tier for a paper.
+
+        The cheapest tier whose input limit fits the prompt is used. Papers whose
+        section structure could not be detected skip the first tier, since a short
+        but unstructured text is usually a bad extraction rather than a short paper.
+
+        Args:
+            input_tokens (int): Estimated prompt tokens of the paper text.
+            section_names (Sequence[str]): Section names detected in the paper.
+
+        Returns:
+            RoutingDecision: The chosen tier and why.
+        """
+        structured = any(name != 'front_matter' for name in section_names)
+        candidates = self.tiers if structured or len(self.tiers) == 1 else self.tiers[1:]
+        for tier in candidates:
+            if tier.max_input_tokens is None or input_tokens <= tier.max_input_tokens:
+                reason = f"{input_tokens} tokens <= {tier.max_input_tokens}" if tier.max_input_tokens else f"{input_tokens} tokens"
+                if not structured:
+                    reason += ", no sections detected"
+                return RoutingDecision(tier, input_tokens, reason)
+        return RoutingDecision(self.tiers[-1], input_tokens, f"{input_tokens} tokens exceed every tier limit")
+
+    def _generate(self, tier: ModelTier, label: str, system_prompt: str, custom_prompt: str,
+                  temperature: float, top_p: float, reason: str = '',
+                  usage_log: Optional[List[dict]] = None) -> str:
+        handler = self.handler_factory(
+            temperature=temperature,
+            max_tokens=tier.max_tokens,
+            top_p=top_p,
+            model_id=tier.model_id,
+        )
+        start = time.perf_counter()
+        output = handler.generate(system_prompt, custom_prompt)
+        latency = time.perf_counter() - start
+        self.logger.info(
+            f"{label}: tier={tier.name} model={tier.model_id} max_tokens={tier.max_tokens} "
+            f"({reason}) latency={latency:.2f}s"
+        )
+        if usage_log is not None:
+            usage = getattr(handler, 'last_usage', None) or {}
+            usage_log.append({
+                'stage': label,
+                'tier': tier.name,
+                'model_id': tier.model_id,
+                'input_tokens': usage.get('input_tokens', 0),
+                'output_tokens': usage.get('output_tokens', 0),
+                'latency_seconds': latency,
+            })
+        return output
+
+    def summarize(self, system_prompt: str, custom_prompt: str, input_tokens: int,
+                  section_names: Sequence[str] = (), usage_log: Optional[List[dict]] = None) -> str:
+        """
+        Generate the summary on the tier chosen by ``route``.
+
+        Args:
+            system_prompt (str): The system prompt.
+            custom_prompt (str): The prompt containing the paper text.
+            input_tokens (int): Estimated prompt tokens of the paper text.
+            section_names (Sequence[str]): Section names detected in the paper.
+            usage_log (Optional[List[dict]]): If given, the call's token usage and latency are appended to it.
+
+        Returns:
+            str: The generated summary.
+        """
+        decision = self.route(input_tokens, section_names)
+        return self._generate(
+            decision.tier, 'summarize', system_prompt, custom_prompt,
+            temperature=config.TEMPERATURE, top_p=config.TOP_P, reason=decision.reason, usage_log=usage_log,
+        )
+
+    def format_check(self, system_prompt: str, custom_prompt: str, usage_log: Optional[List[dict]] = None) -> str:
+        """
+        Run the format-check pass, always on the format-check tier.
+
+        Args:
+            system_prompt (str): The system prompt.
+            custom_prompt (str): The prompt containing the generated slides.
+            usage_log (Optional[List[dict]]): If given, the call's token usage and latency are appended to it.
+
+        Returns:
+            str: The formatted slides.
+        """
+        return self._generate(
+            self.format_check_tier, 'format_check', system_prompt, custom_prompt,
+            temperature=0.3, top_p=0.95, reason='format check', usage_log=usage_log,
+        )
@@ -0,0 +1,154 @@
+import hashlib
+import re
+import struct
+from typing import List, Optional, Tuple
+
+from app.config import config
+from app.db.models.paper_signatures import PaperSignature
+
+
+# Mersenne prime for the universal hash family h(x) = (a * x + b) mod p
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def _permutations(num_perm: int) -> List[Tuple[int, int]]:
+    # Deterministic so signatures computed on different nodes and runs are comparable
+    params = []
+    for i in range(num_perm):
+        digest = hashlib.blake2b(f'minhash-{i}'.encode(), digest_size=16).digest()
+        a, b = struct.unpack('<QQ', digest)
+        params.append((a % (MERSENNE_PRIME - 1) + 1, b % MERSENNE_PRIME))
+    return params
+
+
+_PERMUTATIONS = {}
+
+
+def shingles(text: str, size: int) -> set:
+    """
+    Split text into hashed word n-grams, ignoring case, punctuation and layout.
+
+    Args:
+        text (str): The paper text.
+        size (int): Number of words per shingle.
+
+    Returns:
+        set: 32-bit hashes of the shingles. Empty if the text has fewer than ``size`` words.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    return {
+        struct.unpack('<I', hashlib.blake2b(' '.join(words[i:i + size]).encode(), digest_size=4).digest())[0]
+        for i in range(len(words) - size + 1)
+    }
+
+
+def minhash_signature(
+    text: str,
+    num_perm: Optional[int] = None,
+    shingle_size: Optional[int] = None,
+    min_shingles: Optional[int] = None,
+) -> List[int]:
+    """
+    Compute the MinHash signature of a text.
+
+    Args:
+        text (str): The paper text.
+        num_perm (Optional[int]): Signature length. Defaults to DEDUP_NUM_PERM.
+        shingle_size (Optional[int]): Words per shingle. Defaults to DEDUP_SHINGLE_SIZE.
+        min_shingles (Optional[int]): Minimum number of shingles. Defaults to DEDUP_MIN_SHINGLES.
+
+    Returns:
+        List[int]: The signature, or an empty list if the text is too short to compare reliably
+        (e.g. a scanned PDF whose text extraction failed).
+    """
+    num_perm = num_perm or config.DEDUP_NUM_PERM
+    shingle_size = shingle_size or config.DEDUP_SHINGLE_SIZE
+    min_shingles = config.DEDUP_MIN_SHINGLES if min_shingles is None else min_shingles
+    hashes = shingles(text, shingle_size)
+    if not hashes or len(hashes) < min_shingles:
+        return []
+    if num_perm not in _PERMUTATIONS:
+        _PERMUTATIONS[num_perm] = _permutations(num_perm)
+    return [
+        min(((a * x + b) % MERSENNE_PRIME) & MAX_HASH for x in hashes)
+        for a, b in _PERMUTATIONS[num_perm]
+    ]
+
+
+def lsh_bands(signature: List[int], bands: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Hash each band of a signature for locality-sensitive lookup.
+
+    Two texts share at least one band hash with high probability when their
+    similarity is above roughly ``(1 / bands) ** (1 / rows)``.
+
+    Args:
+        signature (List[int]): A MinHash signature.
+        bands (Optional[int]): Number of bands. Defaults to DEDUP_BANDS.
+
+    Returns:
+        List[Tuple[int, int]]: ``(band_index, band_hash)`` pairs.
+    """
+    bands = bands or config.DEDUP_BANDS
+    rows = len(signature) // bands
+    result = []
+    for band in range(bands):
+        packed = struct.pack(f'<{rows}I', *signature[band * rows:(band + 1) * rows])
+        band_hash = struct.unpack('<q', hashlib.blake2b(packed, digest_size=8).digest())[0]
+        result.append((band, band_hash))
+    return result
+
+
+def estimate_similarity(signature: List[int], other: List[int]) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    if not signature or len(signature) != len(other):
+        return 0.0
+    return sum(1 for a, b in zip(signature, other) if a == b) / len(signature)
+
+
+def pack_signature(signature: List[int]) -> bytes:
+    return struct.pack(f'<{len(signature)}I', *signature)
+
+
+def unpack_signature(data: bytes) -> List[int]:
+    return list(struct.unpack(f'<{len(data) // 4}I', data))
+
+
+def find_near_duplicate(signature: List[int], threshold: Optional[float] = None) -> Optional[Tuple[str, float]]:
+    """
+    Look up the most similar stored paper through the LSH band index.
+
+    Only papers sharing a band hash are compared, so the lookup cost depends on
+    the number of candidates rather than the size of the corpus.
+
+    Args:
+        signature (List[int]): Signature of the new paper.
+        threshold (Optional[float]): Minimum estimated similarity. Defaults to DEDUP_SIMILARITY_THRESHOLD.
+
+    Returns:
+        Optional[Tuple[str, float]]: ``(summary_page_id, similarity)`` of the best match, or None.
+    """
+    if not signature:
+        return None
+    threshold = config.DEDUP_SIMILARITY_THRESHOLD if threshold is None else threshold
+    best = None
+    for page_id, stored in PaperSignature.get_candidates(lsh_bands(signature)):
+        similarity = estimate_similarity(signature, unpack_signature(stored))
+        if similarity >= threshold and (best is None or similarity > best[1]):
+            best = (page_id, similarity)
+    return best
+
+
+def record_signature(summary_page_id: str, signature: List[int]):
+    """
+    Store a paper's signature and its band hashes.
+
+    Args:
+        summary_page_id (str): The SummaryPage the signature belongs to.
+        signature (List[int]): The MinHash signature. Empty signatures are not stored.
+    """
+    if not signature:
+        return
+    PaperSignature.store(summary_page_id, pack_signature(signature), lsh_bands(signature))
@@ -1,27 +1,38 @@
+from typing import List
+
 import PyPDF2
 
 
-def read_pdf(file_path: str) -> str:
+def read_pdf_pages(file_path: str) -> List[str]:
     """
-    Reads a PDF file and extracts its text content.
+    Reads a PDF file and extracts the text content of each page.
 
     Args:
     file_path (str): The path to the PDF file to be read.
 
     Returns:
-    str: The extracted text from the PDF.
+    List[str]: The extracted text of each page, in order.
     """
     try:
         with open(file_path, 'rb') as pdf_file:
             pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ''
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-
-        return text
+            return [page.extract_text() for page in pdf_reader.pages]
     except Exception as e:
         print(f"Error reading PDF: {e}")
-        return ""
+        return []
+
+
+def read_pdf(file_path: str) -> str:
+    """
+    Reads a PDF file and extracts its text content.
+
+    Args:
+    file_path (str): The path to the PDF file to be read.
+
+    Returns:
+    str: The extracted text from the PDF.
+    """
+    return ''.join(read_pdf_pages(file_path))
 
 
 def save_text(text: str, output_file: str) -> None:
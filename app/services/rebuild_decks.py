@@ -0,0 +1,184 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config import config
+from app.db.models.summary_pages import SummaryPage
+from app.services.html_optimizer import html_file_hash, publish_slide
+from app.services.markdown_handler import convert_markdown_dir_to_html
+from app.services.s3_file_handler import S3FileHandler
+
+
+logger = logging.getLogger(__name__)
+
+
+def _load_checkpoint(checkpoint_path: str) -> dict:
+    if not os.path.exists(checkpoint_path):
+        return {}
+    with open(checkpoint_path, 'r') as file:
+        return json.load(file)
+
+
+def _save_checkpoint(checkpoint_path: str, last_id: Optional[str], failed_ids: List[str]):
+    os.makedirs(os.path.dirname(checkpoint_path) or '.', exist_ok=True)
+    tmp_path = f'{checkpoint_path}.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump({'last_id': last_id, 'failed_ids': failed_ids}, file)
+    os.replace(tmp_path, checkpoint_path)
+
+
+class DeckRebuilder:
+    """Re-render stored summaries to HTML and upload the decks whose output changed. No LLM calls."""
+
+    def __init__(
+        self,
+        s3_file_handler: S3FileHandler,
+        render_dir: Callable[[str, str], bool] = convert_markdown_dir_to_html,
+        dry_run: bool = False,
+    ):
+        """
+        Initialize the DeckRebuilder.
+
+        Args:
+            s3_file_handler (S3FileHandler): Handler used for the uploads.
+            render_dir (Callable[[str, str], bool]): Renders every ``.md`` in a directory to ``.html`` in another.
+            dry_run (bool): Render and compare hashes, but upload nothing and write nothing back.
+        """
+        self.s3_file_handler = s3_file_handler
+        self.render_dir = render_dir
+        self.dry_run = dry_run
+
+    def rebuild_batch(self, pages: List[dict]) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Render one batch of pages with a single renderer run and publish the changed decks.
+
+        Args:
+            pages (List[dict]): Rows from ``SummaryPage.iter_summary_batches``.
+
+        Returns:
+            Tuple[Dict[str, int], List[str]]: Counts of ``changed``, ``unchanged`` and ``failed`` decks,
+            and the ids of the failed pages.
+        """
+        counts = {'changed': 0, 'unchanged': 0, 'failed': 0}
+        failed_ids = []
+        work_dir = tempfile.mkdtemp(prefix='rebuild_', dir=config.OUTPUT_DIR)
+        try:
+            md_dir = os.path.join(work_dir, 'md')
+            html_dir = os.path.join(work_dir, 'html')
+            os.makedirs(md_dir)
+            os.makedirs(html_dir)
+            for page in pages:
+                with open(os.path.join(md_dir, f"{page['id']}.md"), 'w') as file:
+                    file.write(page['summary'])
+
+            if not self.render_dir(md_dir, html_dir):
+                logger.error(f"Rendering failed for batch starting at {pages[0]['id']}")
+
+            new_hashes = {}
+            for page in pages:
+                html_path = os.path.join(html_dir, f"{page['id']}.html")
+                if not os.path.exists(html_path):
+                    counts['failed'] += 1
+                    failed_ids.append(page['id'])
+                    continue
+                html_hash = html_file_hash(html_path)
+                if html_hash == page['html_hash']:
+                    counts['unchanged'] += 1
+                    continue
+                counts['changed'] += 1
+                if self.dry_run:
+                    logger.info(f"[dry-run] {page['title']} would be re-published")
+                    continue
+                # Keep the existing object key so published URLs do not change
+                object_key = os.path.basename(page['url'])
+                if publish_slide(self.s3_file_handler, html_path, config.S3_BUCKET_NAME,
+                                 config.S3_UPLOAD_FOLDER_DIR, object_key):
+                    new_hashes[page['id']] = html_hash
+                else:
+                    counts['failed'] += 1
+                    failed_ids.append(page['id'])
+
+            if new_hashes:
+                SummaryPage.set_html_hashes(new_hashes)
+            if failed_ids:
+                logger.error(f"Failed to rebuild {len(failed_ids)} decks: {', '.join(failed_ids)}")
+            return counts, failed_ids
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def run(
+        self,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        resume: bool = False,
+        checkpoint_path: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Stream all summaries from the database and rebuild them in parallel batches.
+
+        The checkpoint records the last id of the highest batch for which every
+        earlier batch has finished, so an interrupted run can resume without gaps.
+        It also lists the pages that failed. Those are retried first on resume, and
+        the checkpoint is kept after a finished run until none are left.
+
+        Args:
+            batch_size (Optional[int]): Pages per renderer run. Defaults to REBUILD_BATCH_SIZE.
+            workers (Optional[int]): Batches rendered concurrently. Defaults to REBUILD_WORKERS.
+            resume (bool): Continue after the id stored in the checkpoint.
+            checkpoint_path (Optional[str]): Checkpoint file. Defaults to REBUILD_CHECKPOINT_PATH.
+
+        Returns:
+            Dict[str, int]: Total counts of ``changed``, ``unchanged`` and ``failed`` decks.
+        """
+        batch_size = batch_size or config.REBUILD_BATCH_SIZE
+        workers = workers or config.REBUILD_WORKERS
+        checkpoint_path = checkpoint_path or config.REBUILD_CHECKPOINT_PATH
+        os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+
+        checkpoint = _load_checkpoint(checkpoint_path) if resume else {}
+        after_id = checkpoint.get('last_id')
+        retry_ids = checkpoint.get('failed_ids', [])
+        if after_id or retry_ids:
+            logger.info(f"Resuming after {after_id}, retrying {len(retry_ids)} failed decks")
+
+        totals = {'changed': 0, 'unchanged': 0, 'failed': 0}
+        failed_ids: List[str] = []
+        in_flight = deque()
+        # Retried pages come before the checkpoint, so their batches do not move it
+        batches = chain(
+            ((None, pages) for pages in SummaryPage.iter_summary_batches(batch_size, ids=retry_ids)) if retry_ids else (),
+            ((pages[-1]['id'], pages) for pages in SummaryPage.iter_summary_batches(batch_size, after_id)),
+        )
+
+        def finish_oldest():
+            nonlocal after_id
+            last_id, future = in_flight.popleft()
+            counts, batch_failed_ids = future.result()
+            for key, value in counts.items():
+                totals[key] += value
+            failed_ids.extend(batch_failed_ids)
+            after_id = last_id or after_id
+            if not self.dry_run:
+                _save_checkpoint(checkpoint_path, after_id, failed_ids)
+            logger.info(f"Rebuilt up to {after_id}: {totals}")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for last_id, pages in batches:
+                # Bound the number of batches held in memory
+                if len(in_flight) >= workers:
+                    finish_oldest()
+                in_flight.append((last_id, executor.submit(self.rebuild_batch, pages)))
+            while in_flight:
+                finish_oldest()
+
+        if failed_ids:
+            logger.error(f"{len(failed_ids)} decks failed; run again with --resume to retry them")
+        elif not self.dry_run and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        return totals
@@ -122,6 +122,74 @@ class S3FileHandler:
             self.logger.error(f"An error occurred while uploading: {e}")
             return False
 
+    def upload_bytes(
+        self,
+        data: bytes,
+        bucket_name: str,
+        bucket_folder_dir: str,
+        object_key: str,
+        content_type: str = 'application/octet-stream',
+        content_encoding: Optional[str] = None,
+        cache_control: Optional[str] = None,
+        overwrite: bool = True
+    ) -> bool:
+        """
+        Upload in-memory data to an S3 bucket.
+
+        Args:
+            data (bytes): The data to upload.
+            bucket_name (str): The name of the S3 bucket.
+            bucket_folder_dir (str): The directory in the S3 bucket where the data will be uploaded.
+            object_key (str): The key of the object in the S3 bucket.
+            content_type (str): The Content-Type header to store with the object.
+            content_encoding (Optional[str]): The Content-Encoding header (e.g. 'gzip', 'br') if the data is pre-compressed.
+            cache_control (Optional[str]): The Cache-Control header to store with the object.
+            overwrite (bool): Whether to overwrite the object if it already exists. Default is True.
+
+        Returns:
+            bool: True if the upload was successful, False otherwise.
+        """
+        try:
+            s3_path = self._get_s3_path(bucket_folder_dir, object_key)
+
+            if not overwrite and self.object_exists(bucket_name, bucket_folder_dir, object_key):
+                self.logger.warning(f"File already exists: s3://{bucket_name}/{s3_path}")
+                return False
+
+            extra_args = {'ContentType': content_type}
+            if content_encoding:
+                extra_args['ContentEncoding'] = content_encoding
+            if cache_control:
+                extra_args['CacheControl'] = cache_control
+
+            self.s3_client.put_object(Bucket=bucket_name, Key=s3_path, Body=data, **extra_args)
+            self.logger.info(f"Successfully uploaded {len(data)} bytes to s3://{bucket_name}/{s3_path}")
+            return True
+        except ClientError as e:
+            self.logger.error(f"An error occurred while uploading: {e}")
+            return False
+
+    def object_exists(self, bucket_name: str, bucket_folder_dir: str, object_key: str) -> bool:
+        """
+        Check whether an object exists in an S3 bucket.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            bucket_folder_dir (str): The directory in the S3 bucket.
+            object_key (str): The key of the object in the S3 bucket.
+
+        Returns:
+            bool: True if the object exists, False otherwise.
+        """
+        s3_path = self._get_s3_path(bucket_folder_dir, object_key)
+        try:
+            self.s3_client.head_object(Bucket=bucket_name, Key=s3_path)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('404', 'NoSuchKey'):
+                raise
+            return False
+
     def get_file_lists(self, bucket_name: str, bucket_folder_dir: str, file_extension: str = '') -> list:
         """
         List all files with a specific extension in a S3 bucket directory.
@@ -147,4 +215,29 @@ class S3FileHandler:
             return files
         except ClientError as e:
             self.logger.error(f"An error occurred while listing files: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def get_file_sizes(self, bucket_name: str, bucket_folder_dir: str, file_extension: str = '') -> dict:
+        """
+        List files with a specific extension in a S3 bucket directory together with their sizes.
+
+        Args:
+            bucket_name (str): The name of the S3 bucket.
+            bucket_folder_dir (str): The directory in the S3 bucket to list files from.
+            file_extension (str): The file extension to filter (e.g., '.pdf'). Default is empty string (all files).
+
+        Returns:
+            dict: ``{file_name: size_in_bytes}``.
+        """
+        try:
+            sizes = {}
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=bucket_folder_dir):
+                for obj in page.get('Contents', []):
+                    file_name = os.path.basename(obj['Key'])
+                    if file_name and file_name.lower().endswith(file_extension.lower()):
+                        sizes[file_name] = obj['Size']
+            return sizes
+        except ClientError as e:
+            self.logger.error(f"An error occurred while listing files: {e}")
+            return {}
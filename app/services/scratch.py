@@ -0,0 +1,66 @@
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.config import config
+
+
+# tmpfs mount used when SCRATCH_TMPFS is enabled (standard on Linux)
+TMPFS_DIR = '/dev/shm'
+
+
+def scratch_root() -> str:
+    """
+    Resolve the directory that holds per-job scratch directories.
+
+    Returns:
+        str: SCRATCH_DIR, a tmpfs directory when SCRATCH_TMPFS is set and available, or OUTPUT_DIR.
+    """
+    if config.SCRATCH_DIR:
+        return config.SCRATCH_DIR
+    if config.SCRATCH_TMPFS and os.path.isdir(TMPFS_DIR):
+        return os.path.join(TMPFS_DIR, 'paper_presentation')
+    return config.OUTPUT_DIR
+
+
+def remove_dir_atomically(path: str):
+    """
+    Remove a directory so that it disappears from its path in a single step.
+
+    The directory is first renamed to a hidden name (an atomic operation on the same
+    filesystem) and only then deleted, so no other job can observe it half-removed.
+
+    Args:
+        path (str): The directory to remove.
+    """
+    trash_path = os.path.join(os.path.dirname(path), f'.trash-{uuid.uuid4().hex}')
+    try:
+        os.rename(path, trash_path)
+    except FileNotFoundError:
+        return
+    shutil.rmtree(trash_path, ignore_errors=True)
+
+
+@contextmanager
+def job_scratch_dir(label: str = 'job') -> Iterator[str]:
+    """
+    Create an isolated scratch directory for one job and remove it when the job ends.
+
+    Args:
+        label (str): Included in the directory name to make it easy to identify.
+
+    Yields:
+        str: Path to the scratch directory.
+    """
+    root = scratch_root()
+    os.makedirs(root, exist_ok=True)
+    safe_label = re.sub(r'[^A-Za-z0-9_.-]', '_', label)[:50]
+    path = tempfile.mkdtemp(prefix=f'{safe_label}-', dir=root)
+    try:
+        yield path
+    finally:
+        remove_dir_atomically(path)
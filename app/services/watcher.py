@@ -0,0 +1,234 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+from urllib.parse import unquote_plus
+
+from app.config import config
+from app.services.s3_file_handler import S3FileHandler
+
+
+class S3PollingSource:
+    """Report PDFs under the raw-files prefix that have not been processed yet. Safe to ack from worker threads."""
+
+    def __init__(self, s3_file_handler: S3FileHandler, bucket_name: str, bucket_folder_dir: str):
+        """
+        Initialize the S3PollingSource.
+
+        Args:
+            s3_file_handler (S3FileHandler): Handler used to list the prefix.
+            bucket_name (str): The name of the S3 bucket.
+            bucket_folder_dir (str): The raw-files directory to watch.
+        """
+        self.s3_file_handler = s3_file_handler
+        self.bucket_name = bucket_name
+        self.bucket_folder_dir = bucket_folder_dir
+        self.seen: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def poll(self) -> List[str]:
+        """
+        List the prefix and return the file names that have not been acknowledged.
+
+        Only the raw-files prefix is listed. A file keeps being reported until ``ack`` is
+        called for it, so a failed job is offered again on the next poll.
+
+        Returns:
+            List[str]: Unprocessed PDF file names.
+        """
+        # The listing is slow, so acks are not blocked while it runs
+        current = self.s3_file_handler.get_file_sizes(self.bucket_name, self.bucket_folder_dir, '.pdf')
+        with self._lock:
+            return sorted(set(current) - self.seen)
+
+    def ack(self, pdf_file: str):
+        """Stop reporting a file once it has been handled."""
+        with self._lock:
+            self.seen.add(pdf_file)
+
+
+class LocalQueueSource:
+    """
+    Read S3 event notifications from a local spool directory, standing in for an SQS queue.
+
+    Each ``*.json`` file holds one notification message (``{"Records": [{"s3": {"object": {"key": ...}}}]}``).
+    Writers should create it atomically (write to another name, then rename). A message is only
+    deleted once every PDF it names has been acknowledged, so a crash or a failed job does not
+    lose the event. Safe to ack from worker threads.
+    """
+
+    def __init__(self, queue_dir: str, bucket_folder_dir: str):
+        """
+        Initialize the LocalQueueSource.
+
+        Args:
+            queue_dir (str): Directory the notifications are written to.
+            bucket_folder_dir (str): Only objects under this directory are reported.
+        """
+        self.queue_dir = queue_dir
+        self.prefix = f"{bucket_folder_dir.rstrip('/')}/"
+        self.logger = logging.getLogger(__name__)
+        # {message_path: file names not acknowledged yet}
+        self.pending: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(queue_dir, exist_ok=True)
+
+    def _read_message(self, message_path: str) -> Optional[Set[str]]:
+        try:
+            with open(message_path, 'r') as file:
+                message = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.error(f"Setting aside unreadable notification {message_path}: {e}")
+            os.replace(message_path, f'{message_path}.invalid')
+            return None
+
+        pdf_files = set()
+        for record in message.get('Records', []):
+            if not record.get('eventName', 'ObjectCreated').startswith('ObjectCreated'):
+                continue
+            # Keys in S3 notifications are URL-encoded
+            key = unquote_plus(record.get('s3', {}).get('object', {}).get('key', ''))
+            if key.startswith(self.prefix) and key.lower().endswith('.pdf'):
+                pdf_files.add(os.path.basename(key))
+        return pdf_files
+
+    def poll(self) -> List[str]:
+        """
+        Read new notifications and return every PDF that has not been acknowledged.
+
+        Returns:
+            List[str]: File names of PDFs created under the raw-files prefix.
+        """
+        # Only the local spool directory is read, so holding the lock here is cheap
+        with self._lock:
+            for message_name in sorted(os.listdir(self.queue_dir)):
+                message_path = os.path.join(self.queue_dir, message_name)
+                if not message_name.endswith('.json') or message_path in self.pending:
+                    continue
+                pdf_files = self._read_message(message_path)
+                if pdf_files is None:
+                    continue
+                if pdf_files:
+                    self.pending[message_path] = pdf_files
+                else:
+                    # Nothing to process (deletions, other prefixes)
+                    os.remove(message_path)
+            return sorted(set().union(*self.pending.values()))
+
+    def ack(self, pdf_file: str):
+        """Mark a file as handled and delete the notifications that have nothing left to process."""
+        with self._lock:
+            for message_path, pdf_files in list(self.pending.items()):
+                pdf_files.discard(pdf_file)
+                if not pdf_files:
+                    del self.pending[message_path]
+                    if os.path.exists(message_path):
+                        os.remove(message_path)
+
+
+class InboxWatcher:
+    """Long-running daemon that hands new uploads to a worker pool as they arrive."""
+
+    def __init__(
+        self,
+        source,
+        process_func: Callable[[str], None],
+        poll_interval: Optional[float] = None,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        """
+        Initialize the InboxWatcher.
+
+        Args:
+            source: ``S3PollingSource`` or ``LocalQueueSource`` (anything with ``poll() -> List[str]``
+                and ``ack(pdf_file)``). ``ack`` is called from worker threads while ``poll`` may be running.
+            process_func (Callable[[str], None]): Processes one PDF file name; raising marks the attempt failed.
+            poll_interval (Optional[float]): Seconds between polls. Defaults to WATCH_POLL_INTERVAL.
+            workers (Optional[int]): Jobs processed concurrently. Defaults to WATCH_WORKERS.
+            max_attempts (Optional[int]): Attempts before a file is given up on. Defaults to WATCH_MAX_ATTEMPTS.
+        """
+        self.source = source
+        self.process_func = process_func
+        self.poll_interval = poll_interval or config.WATCH_POLL_INTERVAL
+        self.workers = workers or config.WATCH_WORKERS
+        self.max_attempts = max_attempts or config.WATCH_MAX_ATTEMPTS
+        self.logger = logging.getLogger(__name__)
+        self.in_flight: Dict[str, Future] = {}
+        self.attempts: Dict[str, int] = {}
+        # Files whose job ended since the current poll started
+        self._finished: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run_job(self, pdf_file: str):
+        try:
+            self.process_func(pdf_file)
+        except Exception as e:
+            with self._lock:
+                self.attempts[pdf_file] = self.attempts.get(pdf_file, 0) + 1
+                if self.attempts[pdf_file] >= self.max_attempts:
+                    self.logger.error(f"Giving up on {pdf_file} after {self.attempts[pdf_file]} attempts: {e}")
+                    self.source.ack(pdf_file)
+                else:
+                    # Not acknowledged, so the source offers it again on the next poll
+                    self.logger.error(f"Failed to process {pdf_file} (attempt {self.attempts[pdf_file]}): {e}")
+        else:
+            with self._lock:
+                self.attempts.pop(pdf_file, None)
+                self.source.ack(pdf_file)
+        finally:
+            with self._lock:
+                self.in_flight.pop(pdf_file, None)
+                self._finished.add(pdf_file)
+
+    def poll_once(self, executor: ThreadPoolExecutor) -> int:
+        """
+        Poll the source once and submit new files that are not already being processed.
+
+        Returns:
+            int: Number of jobs submitted.
+        """
+        with self._lock:
+            self._finished.clear()
+        # Not polled under the lock: listing can be slow and jobs need the lock to finish
+        pdf_files = self.source.poll()
+
+        submitted = 0
+        with self._lock:
+            for pdf_file in pdf_files:
+                # A job that ended during the poll may still be listed; a failed one is offered again next poll
+                if pdf_file in self.in_flight or pdf_file in self._finished:
+                    continue
+                self.in_flight[pdf_file] = executor.submit(self._run_job, pdf_file)
+                submitted += 1
+        if submitted:
+            self.logger.info(f"Submitted {submitted} new PDFs ({len(self.in_flight)} in flight)")
+        return submitted
+
+    def run(self, max_polls: Optional[int] = None):
+        """
+        Poll until stopped, then wait for running jobs to finish.
+
+        Args:
+            max_polls (Optional[int]): Stop after this many polls (for tests and one-off runs).
+        """
+        self.logger.info(f"Watching for new PDFs every {self.poll_interval}s with {self.workers} workers")
+        polls = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not self._stop.is_set():
+                try:
+                    self.poll_once(executor)
+                except Exception as e:
+                    # A failed listing should not bring the daemon down; retry on the next poll
+                    self.logger.error(f"Polling failed: {e}")
+                polls += 1
+                if max_polls is not None and polls >= max_polls:
+                    break
+                self._stop.wait(self.poll_interval)
+        self.logger.info("Watcher stopped")
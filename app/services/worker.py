@@ -0,0 +1,100 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from typing import Callable, Optional
+
+from app.config import config
+from app.db.models.paper_jobs import PaperJob
+
+
+def default_worker_id() -> str:
+    """Build a worker id that is unique across hosts and processes."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class Worker:
+    """Claim paper jobs from the jobs table and process them while keeping their lease alive."""
+
+    def __init__(
+        self,
+        process_func: Callable[[str], None],
+        worker_id: Optional[str] = None,
+        lease_seconds: Optional[int] = None,
+        heartbeat_interval: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        """
+        Initialize the Worker.
+
+        Args:
+            process_func (Callable[[str], None]): Processes one object key; raising marks the attempt failed.
+            worker_id (Optional[str]): Identifier stored on claimed jobs. Defaults to host-pid-random.
+            lease_seconds (Optional[int]): Lease length without a heartbeat. Defaults to WORKER_LEASE_SECONDS.
+            heartbeat_interval (Optional[float]): Seconds between heartbeats. Defaults to WORKER_HEARTBEAT_INTERVAL.
+            poll_interval (Optional[float]): Seconds to wait when the queue is empty. Defaults to WORKER_POLL_INTERVAL.
+            max_attempts (Optional[int]): Attempts before a job is marked failed. Defaults to WORKER_MAX_ATTEMPTS.
+        """
+        self.process_func = process_func
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds or config.WORKER_LEASE_SECONDS
+        self.heartbeat_interval = heartbeat_interval or config.WORKER_HEARTBEAT_INTERVAL
+        self.poll_interval = poll_interval or config.WORKER_POLL_INTERVAL
+        self.max_attempts = max_attempts or config.WORKER_MAX_ATTEMPTS
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _heartbeat_loop(self, job_id: str, done: threading.Event):
+        while not done.wait(self.heartbeat_interval):
+            if not PaperJob.heartbeat(job_id, self.worker_id, self.lease_seconds):
+                self.logger.warning(f"Worker {self.worker_id} lost the lease on job {job_id}")
+                return
+
+    def run_once(self) -> bool:
+        """
+        Claim and process a single job.
+
+        Returns:
+            bool: True if a job was claimed, False if the queue was empty.
+        """
+        job = PaperJob.claim(self.worker_id, self.lease_seconds, self.max_attempts)
+        if job is None:
+            return False
+
+        self.logger.info(f"Worker {self.worker_id} claimed {job.object_key} (attempt {job.attempts})")
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(job.id, done), daemon=True)
+        heartbeat.start()
+        try:
+            self.process_func(job.object_key)
+        except Exception as e:
+            self.logger.error(f"Worker {self.worker_id} failed on {job.object_key}: {e}")
+            PaperJob.fail(job.id, self.worker_id, str(e), self.max_attempts)
+        else:
+            if not PaperJob.complete(job.id, self.worker_id):
+                self.logger.warning(f"Worker {self.worker_id} finished {job.object_key} after losing its lease")
+        finally:
+            done.set()
+            heartbeat.join()
+        return True
+
+    def run(self, exit_when_idle: bool = False):
+        """
+        Process jobs until stopped.
+
+        Args:
+            exit_when_idle (bool): Return as soon as the queue is empty instead of polling.
+        """
+        self.logger.info(f"Worker {self.worker_id} started")
+        while not self._stop.is_set():
+            if self.run_once():
+                continue
+            if exit_when_idle:
+                break
+            self._stop.wait(self.poll_interval)
+        self.logger.info(f"Worker {self.worker_id} stopped")
@@ -0,0 +1,39 @@
+import pytest
+
+from app.db.models.base import Base, configure_engine
+
+
+class FakeS3FileHandler:
+    """In-memory stand-in for S3FileHandler that records every upload."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploaded = []
+        # {object_key: size} returned by get_file_sizes
+        self.files = {}
+
+    def object_exists(self, bucket_name, bucket_folder_dir, object_key):
+        return f"{bucket_folder_dir}/{object_key}" in self.objects
+
+    def upload_bytes(self, data, bucket_name, bucket_folder_dir, object_key, **headers):
+        key = f"{bucket_folder_dir}/{object_key}"
+        self.objects[key] = (data, headers)
+        self.uploaded.append(key)
+        return True
+
+    def get_file_sizes(self, bucket_name, bucket_folder_dir, extension):
+        return dict(self.files)
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    # A file database gives each thread its own connection
+    engine = configure_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def s3_file_handler():
+    return FakeS3FileHandler()
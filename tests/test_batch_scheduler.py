@@ -0,0 +1,113 @@
+import pytest
+
+from app.db.models.llm_usages import LLMUsage
+from app.db.models.summary_pages import SummaryPage
+from app.services.batch_scheduler import BudgetScheduler, PaperFailed
+
+
+PDF_SIZES = {"large.pdf": 500_000, "small.pdf": 100_000, "medium.pdf": 200_000}
+
+
+def test_plan_orders_cheapest_first():
+    planned = BudgetScheduler(tokens_per_pdf_byte=0.01).plan(PDF_SIZES)
+    assert [paper.object_key for paper in planned] == ["small.pdf", "medium.pdf", "large.pdf"]
+    assert planned[0].estimated_tokens == 1000
+
+
+def test_run_defers_papers_over_token_budget():
+    processed = []
+
+    def process(object_key):
+        processed.append(object_key)
+        return PDF_SIZES[object_key] // 100
+
+    result = BudgetScheduler(token_budget=3500, tokens_per_pdf_byte=0.01).run(PDF_SIZES, process)
+    assert processed == ["small.pdf", "medium.pdf"]
+    assert result.deferred == ["large.pdf"]
+    assert result.tokens_used == 3000
+    assert result.stop_reason.startswith("token budget")
+
+
+def test_run_stops_at_time_budget():
+    now = [0.0]
+
+    def process(object_key):
+        now[0] += 60
+        return 0
+
+    result = BudgetScheduler(time_budget_seconds=100, clock=lambda: now[0]).run(PDF_SIZES, process)
+    assert len(result.processed) == 2
+    assert result.deferred == ["large.pdf"]
+
+
+def test_failed_paper_does_not_abort_the_batch():
+    def process(object_key):
+        if object_key == "small.pdf":
+            raise PaperFailed("throttled", tokens_used=700)
+        return 1000
+
+    result = BudgetScheduler(tokens_per_pdf_byte=0.01).run(PDF_SIZES, process)
+    assert result.processed == ["medium.pdf", "large.pdf"]
+    assert result.failed == {"small.pdf": "throttled"}
+    assert result.tokens_used == 2700
+
+
+def test_usage_report_and_cost_rates(sqlite_engine):
+    page_id = SummaryPage.insert_or_update_record("paper", "https://cdn/paper/paper_slide.html", "# paper")
+    LLMUsage.record_many(page_id, "paper.pdf", 100_000, [
+        {"stage": "summarize", "tier": "fast", "model_id": "fast-model",
+         "input_tokens": 1500, "output_tokens": 500, "latency_seconds": 4.0},
+        {"stage": "format_check", "tier": "format_check", "model_id": "cheap-model",
+         "input_tokens": 600, "output_tokens": 400, "latency_seconds": 2.0},
+    ])
+
+    report = {row["stage"]: row for row in LLMUsage.report(group_by="stage")}
+    assert report["summarize"]["total_tokens"] == 2000
+    assert report["format_check"]["calls"] == 1
+
+    rates = LLMUsage.cost_rates()
+    assert rates["tokens_per_pdf_byte"] == pytest.approx(0.03)
+    assert rates["seconds_per_token"] == pytest.approx(0.002)
+
+
+def test_usage_is_recorded_when_a_paper_fails_after_the_llm_calls(sqlite_engine, tmp_path, monkeypatch):
+    from app import main
+
+    class FetchingS3FileHandler:
+        def fetch_file(self, bucket_name, bucket_folder_dir, object_key, output_path):
+            with open(output_path, "wb") as file:
+                file.write(b"%PDF")
+            return output_path
+
+    class FakePaper:
+        text = "paper text"
+
+        def prompt_text(self, excluded_sections):
+            return self.text
+
+        def report(self, excluded_sections):
+            return {"sections": ["introduction"], "dropped_sections": [], "original_tokens": 3,
+                    "prompt_tokens": 3, "saved_tokens": 0}
+
+    class FakeRouter:
+        def summarize(self, system_prompt, custom_prompt, input_tokens, section_names, usage_log):
+            usage_log.append({"stage": "summarize", "input_tokens": 1000, "output_tokens": 200})
+            return "# slides"
+
+        def format_check(self, system_prompt, custom_prompt, usage_log):
+            usage_log.append({"stage": "format_check", "input_tokens": 300, "output_tokens": 200})
+            return "# slides"
+
+    def broken_renderer(md_path, html_path):
+        raise RuntimeError("marp crashed")
+
+    monkeypatch.setattr(main.config, "SCRATCH_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "extract_paper", lambda pdf_path: FakePaper())
+    monkeypatch.setattr(main, "create_system_prompt", lambda *paths: "system")
+    monkeypatch.setattr(main, "convert_markdown_to_html", broken_renderer)
+
+    with pytest.raises(RuntimeError):
+        main.process_pdf_file("paper.pdf", FetchingS3FileHandler(), FakeRouter())
+
+    assert SummaryPage.get_record_by_title("paper") is None
+    assert sum(row["total_tokens"] for row in LLMUsage.report(group_by="stage")) == 1700
@@ -0,0 +1,62 @@
+import pytest
+
+from app.db.models import base
+from app.db.models.base import get_pool_metrics, session_scope
+from app.db.models.summary_pages import SummaryPage
+
+
+def test_insert_and_get_record(sqlite_engine):
+    record_id = SummaryPage.insert_or_update_record("paper", "https://example.com/paper_slide.html", "summary")
+    record = SummaryPage.get_record_by_title("paper")
+    assert record.id == record_id
+    assert SummaryPage.get_summary_by_id(record_id) == "summary"
+
+
+def test_session_scope_shares_session_and_rolls_back(sqlite_engine):
+    with pytest.raises(RuntimeError):
+        with session_scope() as outer:
+            SummaryPage.insert_or_update_record("paper", "https://example.com/paper_slide.html", "summary")
+            with session_scope() as inner:
+                assert inner is outer
+            raise RuntimeError("abort")
+    assert SummaryPage.get_record_by_title("paper") is None
+
+
+def test_pool_metrics(sqlite_engine):
+    SummaryPage.get_all()
+    metrics = get_pool_metrics()
+    assert metrics["checkouts"] >= 1
+    assert metrics["acquire_count"] >= 1
+    assert base.engine is sqlite_engine
+
+    before = get_pool_metrics()["acquire_count"]
+    with session_scope():
+        SummaryPage.get_all()
+        SummaryPage.get_record_by_title("paper")
+    # Nested scopes share the outer scope's connection
+    assert get_pool_metrics()["acquire_count"] == before + 1
+
+
+def test_summary_is_stored_compressed_and_loaded_lazily(sqlite_engine):
+    summary = "---\nmarp: true\n---\n\n# Slide\n" * 200
+    record_id = SummaryPage.insert_or_update_record("paper", "https://example.com/paper_slide.html", summary)
+
+    record = SummaryPage.get_record_by_title("paper")
+    assert "body" not in record.__dict__
+
+    record = SummaryPage.get_record_by_title("paper", with_summary=True)
+    assert record.body.raw_size == len(summary.encode("utf-8"))
+    assert len(record.body.body) < record.body.raw_size
+    assert record.summary == summary
+    assert SummaryPage.get_summary_by_id(record_id) == summary
+
+
+def test_summary_of_detached_records(sqlite_engine):
+    SummaryPage.insert_or_update_record("paper", "https://example.com/paper_slide.html", "summary")
+
+    assert SummaryPage.get_all()[0].summary == "summary"
+    assert SummaryPage.get_record_by_title("paper").summary == "summary"
+
+    record = SummaryPage.get_all(with_summary=True)[0]
+    assert "body" in record.__dict__
+    assert record.summary == "summary"
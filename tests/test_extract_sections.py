@@ -0,0 +1,94 @@
+from app.services.extract_sections import (
+    classify_heading,
+    extract_paper_pages,
+    rejoin_hyphenation,
+    strip_page_furniture,
+)
+
+
+PAGES = [
+    "Preprint under review\nSparse Attention for Long Documents\nJane Doe\nAbstract—We propose a sparse attention method.\n1 Introduction\nLong documents are expen-\nsive to summarize.\n1",
+    "Preprint under review\n2 Method\nWe drop most attention edges.\n3.1 Model Architecture\nA standard transformer.\n2",
+    "Preprint under review\n4 Experiments\nResults show that the method is fast.\n5 Conclusion\nSparse attention works.\n3",
+    "Preprint under review\nReferences\n[1] A. Author. Attention is all you need. 2017.\n[2] B. Author. Longformer. 2020.\nA Proofs\nLemma 1 holds.\n4",
+]
+
+
+def test_strip_page_furniture_removes_running_headers_and_page_numbers():
+    pages = strip_page_furniture(PAGES)
+    assert all("Preprint under review" not in page for page in pages)
+    assert all(not page.rstrip().endswith(("\n1", "\n2", "\n3", "\n4")) for page in pages)
+    assert "We drop most attention edges." in pages[1]
+
+
+def test_rejoin_hyphenation():
+    assert rejoin_hyphenation("expen-\nsive") == "expensive"
+
+
+def test_classify_heading():
+    assert classify_heading("1 Introduction")[0] == "introduction"
+    assert classify_heading("IV. EXPERIMENTAL RESULTS")[0] == "results"
+    assert classify_heading("Abstract. We propose X.") == ("abstract", "Abstract", "We propose X.")
+    assert classify_heading("Results show that the method is fast.") is None
+
+
+def test_extract_paper_drops_references_and_appendix():
+    paper = extract_paper_pages(PAGES)
+    assert paper.section_names() == [
+        "front_matter", "abstract", "introduction", "method", "method", "results", "conclusion",
+        "references", "appendix",
+    ]
+
+    prompt_text = paper.prompt_text(["references", "appendix"])
+    assert "expensive to summarize" in prompt_text
+    assert "Longformer" not in prompt_text
+    assert "Lemma 1" not in prompt_text
+
+    report = paper.report(["references", "appendix"])
+    assert report["dropped_sections"] == ["references", "appendix"]
+    assert report["saved_tokens"] > 0
+    assert report["original_tokens"] == report["prompt_tokens"] + report["saved_tokens"]
+
+
+def test_stray_references_line_in_body_does_not_start_back_matter():
+    text = (
+        "Title\n1 Introduction\nIntro text.\nBibliography\n2 Method\nWe do things.\n"
+        "3 Experiments\nIt works well.\n4 Conclusion\nDone."
+    )
+    paper = extract_paper_pages([text])
+    assert paper.section_names() == ["front_matter", "introduction", "method", "results", "conclusion"]
+    assert paper.report(["references", "appendix"])["saved_tokens"] == 0
+
+
+def test_one_word_table_cell_does_not_start_a_section():
+    text = (
+        "Title\n1 Introduction\nIntro text.\n2 Method\nTable 1\nBaseline\nSupplementary\n0.93\n"
+        "The method keeps this sentence.\n3 Conclusion\nDone.\nReferences\n[1] X.\nAppendix\nProofs."
+    )
+    paper = extract_paper_pages([text])
+    assert paper.section_names() == [
+        "front_matter", "introduction", "method", "conclusion", "references", "appendix",
+    ]
+    prompt_text = paper.prompt_text(["references", "appendix"])
+    assert "The method keeps this sentence." in prompt_text
+    assert "Proofs." not in prompt_text
+
+
+def test_long_appendix_after_references_is_dropped():
+    body = "Title\n1 Introduction\nIntro text.\n2 Method\nWe do things.\n3 Conclusion\nDone.\n"
+    references = "References\n" + "".join(
+        f"Author{i}, A. and Other, B. A study of topic {i}. In Proceedings, 2020.\n" if i % 2 else f"[{i}] C. Writer. Paper {i}. 2019.\n"
+        for i in range(150)
+    )
+    appendix = "A Proofs\n" + "".join(f"Proof step {i} follows from the lemma.\n" for i in range(750))
+    appendix += "B Additional Experiments\n" + "".join(f"Run {i} gives the same result.\n" for i in range(750))
+
+    paper = extract_paper_pages([body + references + appendix])
+    assert paper.section_names() == [
+        "front_matter", "introduction", "method", "conclusion", "references", "appendix", "appendix",
+    ]
+    prompt_text = paper.prompt_text(["references", "appendix"])
+    assert "We do things." in prompt_text
+    assert "Paper 2." not in prompt_text
+    assert "Proof step" not in prompt_text
+    assert "Run 1 " not in prompt_text
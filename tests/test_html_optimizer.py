@@ -0,0 +1,92 @@
+import gzip
+
+from app.config import config
+from app.services.html_optimizer import extract_shared_assets, minify_css, minify_html, publish_slide, publish_slide_html
+
+
+THEME_CSS = "/* theme */\nsection {\n  color: #333;\n}\n" + "h1 { font-size: 2em; }\n" * 100
+RUNTIME_JS = "!function(){var a = 1;\n  console.log(a)}();" * 50
+DECK = f"""<!DOCTYPE html>
+<html>
+  <head>
+    <!-- generated by marp -->
+    <style>{THEME_CSS}</style>
+  </head>
+  <body>
+    <section>
+      <p>a <b>x</b> <i>y</i></p>
+      <pre>x = 1
+    y = 2</pre>
+    </section>
+    <script>{RUNTIME_JS}</script>
+  </body>
+</html>
+"""
+
+
+def test_minify_html_keeps_inline_spacing_and_pre_blocks():
+    html = minify_html(DECK)
+    assert "<!--" not in html
+    assert "<p>a <b>x</b> <i>y</i></p>" in html
+    assert "<pre>x = 1\n    y = 2</pre>" in html
+    assert RUNTIME_JS in html
+
+
+def test_minify_css():
+    assert minify_css("/* c */ a :hover ,\n b {\n color: red;\n}") == "a :hover,b{color: red}"
+
+
+def test_extract_shared_assets_is_content_addressed():
+    html, assets = extract_shared_assets(DECK, lambda name: f"https://cdn/assets/{name}", 1024)
+    other_html, other_assets = extract_shared_assets(DECK.replace("<p>a", "<p>b"), lambda name: f"https://cdn/assets/{name}", 1024)
+    assert set(assets) == set(other_assets)
+    assert len(assets) == 2
+    assert '<link rel="stylesheet" href="https://cdn/assets/' in html
+    assert THEME_CSS not in html
+
+
+def test_publish_slide_html_uploads_compressed_deck_and_assets_once(s3_file_handler, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SLIDE_HTML_BROTLI", False)
+    html_path = tmp_path / "deck_slide.html"
+    html_path.write_text(DECK)
+
+    stats = publish_slide_html(s3_file_handler, str(html_path), "bucket", "paper", "deck_slide.html")
+    data, headers = s3_file_handler.objects["paper/deck_slide.html"]
+    assert headers["content_encoding"] == "gzip"
+    assert headers["cache_control"]
+    assert "<section>" in gzip.decompress(data).decode("utf-8")
+    assert stats["gzip_bytes"] < stats["minified_bytes"] < stats["raw_bytes"]
+
+    asset_uploads = [key for key in s3_file_handler.uploaded if key.startswith("assets/")]
+    assert len(asset_uploads) == stats["assets"]
+
+    s3_file_handler.uploaded = []
+    publish_slide_html(s3_file_handler, str(html_path), "bucket", "paper", "other_slide.html")
+    # Only the new deck is uploaded; the shared assets already exist
+    assert not [key for key in s3_file_handler.uploaded if key.startswith("assets/")]
+    assert "paper/other_slide.html" in s3_file_handler.uploaded
+
+
+def test_publish_slide_reports_failed_uploads(s3_file_handler, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SLIDE_HTML_OPTIMIZE", True)
+    html_path = tmp_path / "deck_slide.html"
+    html_path.write_text(DECK)
+    upload_bytes = s3_file_handler.upload_bytes
+
+    def fail_for(prefix):
+        def upload(data, bucket_name, bucket_folder_dir, object_key, **headers):
+            if bucket_folder_dir == prefix:
+                return False
+            return upload_bytes(data, bucket_name, bucket_folder_dir, object_key, **headers)
+        return upload
+
+    monkeypatch.setattr(s3_file_handler, "upload_bytes", fail_for("assets"))
+    assert publish_slide(s3_file_handler, str(html_path), "bucket", "paper", "deck_slide.html") is False
+    assert "paper/deck_slide.html" not in s3_file_handler.objects
+
+    monkeypatch.setattr(s3_file_handler, "upload_bytes", fail_for("paper"))
+    assert publish_slide_html(s3_file_handler, str(html_path), "bucket", "paper", "deck_slide.html") is None
+    assert publish_slide(s3_file_handler, str(html_path), "bucket", "paper", "deck_slide.html") is False
+
+    monkeypatch.setattr(s3_file_handler, "upload_bytes", upload_bytes)
+    assert publish_slide(s3_file_handler, str(html_path), "bucket", "paper", "deck_slide.html") is True
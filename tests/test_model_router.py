@@ -0,0 +1,47 @@
+from app.services.model_router import ModelRouter, ModelTier
+
+
+class FakeLLMHandler:
+    calls = []
+
+    def __init__(self, temperature, max_tokens, top_p, model_id):
+        self.model_id = model_id
+        self.max_tokens = max_tokens
+
+    def generate(self, system_prompt, custom_prompt):
+        FakeLLMHandler.calls.append((self.model_id, self.max_tokens))
+        return f"{self.model_id}: {custom_prompt}"
+
+
+def build_router():
+    FakeLLMHandler.calls = []
+    return ModelRouter(
+        tiers=[
+            ModelTier("fast", "fast-model", 2048, 10000),
+            ModelTier("standard", "standard-model", 8192, 50000),
+            ModelTier("large", "large-model", 8192, None),
+        ],
+        format_check_tier=ModelTier("format_check", "cheap-model", 6000),
+        handler_factory=FakeLLMHandler,
+    )
+
+
+def test_route_by_input_tokens():
+    router = build_router()
+    sections = ["front_matter", "abstract", "introduction"]
+    assert router.route(3000, sections).tier.name == "fast"
+    assert router.route(20000, sections).tier.name == "standard"
+    assert router.route(90000, sections).tier.name == "large"
+
+
+def test_unstructured_paper_skips_fast_tier():
+    router = build_router()
+    assert router.route(3000, ["front_matter"]).tier.name == "standard"
+
+
+def test_summarize_and_format_check_use_routed_models():
+    router = build_router()
+    summary = router.summarize("system", "paper", 3000, ["abstract"])
+    assert summary == "fast-model: paper"
+    router.format_check("system", summary)
+    assert FakeLLMHandler.calls == [("fast-model", 2048), ("cheap-model", 6000)]
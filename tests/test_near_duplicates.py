@@ -0,0 +1,85 @@
+import random
+
+from app.db.models.paper_signatures import PaperSignature
+from app.db.models.summary_pages import SummaryPage
+from app.services.near_duplicates import (
+    estimate_similarity,
+    find_near_duplicate,
+    lsh_bands,
+    minhash_signature,
+    record_signature,
+)
+
+
+def random_text(seed, words=2000):
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(5000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def test_signature_similarity():
+    text = random_text(0)
+    revised = text.replace("word1 ", "Word1, ", 3) + " " + random_text(1, words=50)
+    assert estimate_similarity(minhash_signature(text), minhash_signature(revised)) > 0.8
+    assert estimate_similarity(minhash_signature(text), minhash_signature(random_text(2))) < 0.1
+
+
+def test_find_near_duplicate_through_band_index(sqlite_engine):
+    text = random_text(0)
+    page_id = SummaryPage.insert_or_update_record("paper_v1", "https://cdn/paper/paper_v1_slide.html", "# v1")
+    record_signature(page_id, minhash_signature(text))
+    for seed in range(1, 20):
+        other_id = SummaryPage.insert_or_update_record(f"other{seed}", f"https://cdn/paper/other{seed}_slide.html", "#")
+        record_signature(other_id, minhash_signature(random_text(seed)))
+
+    match = find_near_duplicate(minhash_signature(text + " " + random_text(99, words=40)))
+    assert match is not None and match[0] == page_id
+    assert find_near_duplicate(minhash_signature(random_text(100))) is None
+
+
+def test_candidates_share_a_band_instead_of_scanning_the_corpus(sqlite_engine):
+    text = random_text(0)
+    page_id = SummaryPage.insert_or_update_record("paper_v1", "https://cdn/paper/paper_v1_slide.html", "# v1")
+    record_signature(page_id, minhash_signature(text))
+    for seed in range(1, 50):
+        other_id = SummaryPage.insert_or_update_record(f"other{seed}", f"https://cdn/paper/other{seed}_slide.html", "#")
+        record_signature(other_id, minhash_signature(random_text(seed, words=300)))
+
+    candidates = PaperSignature.get_candidates(lsh_bands(minhash_signature(text + " " + random_text(99, words=40))))
+    assert [candidate_id for candidate_id, _ in candidates] == [page_id]
+    assert PaperSignature.get_candidates(lsh_bands(minhash_signature(random_text(100)))) == []
+
+
+def test_insert_duplicate_link(sqlite_engine):
+    page_id = SummaryPage.insert_or_update_record("paper_v1", "https://cdn/paper/paper_v1_slide.html", "# v1")
+    link_id = SummaryPage.insert_duplicate_link("paper_v2", page_id)
+    record = SummaryPage.get_record_by_title("paper_v2")
+    assert record.id == link_id
+    assert record.duplicate_of_id == page_id
+    assert record.url == "https://cdn/paper/paper_v1_slide.html"
+
+
+def test_duplicate_link_has_no_body_and_is_not_rebuilt(sqlite_engine):
+    page_id = SummaryPage.insert_or_update_record("paper_v1", "https://cdn/paper/paper_v1_slide.html", "# v1")
+    link_id = SummaryPage.insert_duplicate_link("paper_v2", page_id)
+
+    assert SummaryPage.get_summary_by_id(link_id) is None
+    pages = [page for batch in SummaryPage.iter_summary_batches(10) for page in batch]
+    assert [(page["id"], page["summary"]) for page in pages] == [(page_id, "# v1")]
+
+
+def test_short_or_empty_text_is_not_deduplicated(sqlite_engine):
+    assert minhash_signature("") == []
+    assert minhash_signature("Scanned page 1") == []
+
+    page_id = SummaryPage.insert_or_update_record("scan1", "https://cdn/paper/scan1_slide.html", "# scan1")
+    record_signature(page_id, minhash_signature(""))
+    assert find_near_duplicate(minhash_signature("")) is None
+
+
+def test_skipped_duplicate_is_recorded_without_a_deck(sqlite_engine):
+    page_id = SummaryPage.insert_or_update_record("paper_v1", "https://cdn/paper/paper_v1_slide.html", "# v1")
+    SummaryPage.insert_duplicate_link("paper_v2", page_id, link=False)
+    record = SummaryPage.get_record_by_title("paper_v2")
+    assert record.duplicate_of_id == page_id
+    assert record.url is None
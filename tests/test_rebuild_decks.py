@@ -0,0 +1,110 @@
+import json
+import os
+
+from app.config import config
+from app.db.models.summary_pages import SummaryPage
+from app.services.rebuild_decks import DeckRebuilder
+
+
+def render_dir(theme):
+    def render(md_dir, html_dir):
+        for name in os.listdir(md_dir):
+            with open(os.path.join(md_dir, name)) as md_file:
+                html = f"<html><style>{theme}</style><body>{md_file.read()}</body></html>"
+            with open(os.path.join(html_dir, name.replace(".md", ".html")), "w") as html_file:
+                html_file.write(html)
+        return True
+    return render
+
+
+def test_rebuild_uploads_only_changed_decks(sqlite_engine, s3_file_handler, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "SLIDE_HTML_BROTLI", False)
+    for i in range(5):
+        SummaryPage.insert_or_update_record(f"paper{i}", f"https://cdn/paper/paper{i}_slide.html", f"# Paper {i}")
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+
+    totals = DeckRebuilder(s3_file_handler, render_dir("a{}"), dry_run=True).run(2, 2, checkpoint_path=checkpoint_path)
+    assert totals == {"changed": 5, "unchanged": 0, "failed": 0}
+    assert s3_file_handler.uploaded == []
+
+    totals = DeckRebuilder(s3_file_handler, render_dir("a{}")).run(2, 2, checkpoint_path=checkpoint_path)
+    assert totals["changed"] == 5
+    assert "paper/paper0_slide.html" in s3_file_handler.uploaded
+    assert not os.path.exists(checkpoint_path)
+
+    s3_file_handler.uploaded = []
+    totals = DeckRebuilder(s3_file_handler, render_dir("a{}")).run(2, 2, checkpoint_path=checkpoint_path)
+    assert totals == {"changed": 0, "unchanged": 5, "failed": 0}
+    assert s3_file_handler.uploaded == []
+
+    totals = DeckRebuilder(s3_file_handler, render_dir("b{}")).run(2, 2, checkpoint_path=checkpoint_path)
+    assert totals["changed"] == 5
+
+
+def test_rebuild_resumes_after_checkpoint(sqlite_engine, s3_file_handler, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "OUTPUT_DIR", str(tmp_path))
+    ids = sorted(
+        SummaryPage.insert_or_update_record(f"paper{i}", f"https://cdn/paper/paper{i}_slide.html", f"# Paper {i}")
+        for i in range(4)
+    )
+    checkpoint_path = tmp_path / "checkpoint.json"
+    checkpoint_path.write_text(f'{{"last_id": "{ids[1]}"}}')
+
+    totals = DeckRebuilder(s3_file_handler, render_dir("a{}")).run(
+        1, 1, resume=True, checkpoint_path=str(checkpoint_path)
+    )
+    assert totals["changed"] == 2
+
+
+def test_failed_decks_are_retried_on_resume(sqlite_engine, s3_file_handler, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "OUTPUT_DIR", str(tmp_path))
+    ids = sorted(
+        SummaryPage.insert_or_update_record(f"paper{i}", f"https://cdn/paper/paper{i}_slide.html", f"# Paper {i}")
+        for i in range(4)
+    )
+    checkpoint_path = tmp_path / "checkpoint.json"
+    render = render_dir("a{}")
+
+    def render_without_first(md_dir, html_dir):
+        first_md = os.path.join(md_dir, f"{ids[0]}.md")
+        if os.path.exists(first_md):
+            os.remove(first_md)
+        return render(md_dir, html_dir)
+
+    totals = DeckRebuilder(s3_file_handler, render_without_first).run(2, 2, checkpoint_path=str(checkpoint_path))
+    assert totals == {"changed": 3, "unchanged": 0, "failed": 1}
+    assert json.loads(checkpoint_path.read_text()) == {"last_id": ids[-1], "failed_ids": [ids[0]]}
+
+    totals = DeckRebuilder(s3_file_handler, render).run(2, 2, resume=True, checkpoint_path=str(checkpoint_path))
+    assert totals == {"changed": 1, "unchanged": 0, "failed": 0}
+    assert not checkpoint_path.exists()
+
+
+def test_failed_uploads_are_counted_and_retried(sqlite_engine, s3_file_handler, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "SLIDE_HTML_OPTIMIZE", True)
+    ids = [
+        SummaryPage.insert_or_update_record(f"paper{i}", f"https://cdn/paper/paper{i}_slide.html", f"# Paper {i}")
+        for i in range(2)
+    ]
+    checkpoint_path = tmp_path / "checkpoint.json"
+    upload_bytes = s3_file_handler.upload_bytes
+
+    def fail_first(data, bucket_name, bucket_folder_dir, object_key, **headers):
+        if object_key == "paper0_slide.html":
+            return False
+        return upload_bytes(data, bucket_name, bucket_folder_dir, object_key, **headers)
+
+    monkeypatch.setattr(s3_file_handler, "upload_bytes", fail_first)
+    totals = DeckRebuilder(s3_file_handler, render_dir("a{}")).run(2, 1, checkpoint_path=str(checkpoint_path))
+    assert totals["failed"] == 1
+    assert json.loads(checkpoint_path.read_text())["failed_ids"] == [ids[0]]
+    # The hash is only stored for the deck that was uploaded
+    hashes = {page["title"]: page["html_hash"] for page in next(SummaryPage.iter_summary_batches(2))}
+    assert hashes["paper0"] is None and hashes["paper1"] is not None
+
+    monkeypatch.setattr(s3_file_handler, "upload_bytes", upload_bytes)
+    totals = DeckRebuilder(s3_file_handler, render_dir("a{}")).run(2, 1, resume=True, checkpoint_path=str(checkpoint_path))
+    assert totals == {"changed": 1, "unchanged": 0, "failed": 0}
+    assert "paper/paper0_slide.html" in s3_file_handler.objects
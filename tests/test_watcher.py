@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+
+from app.config import config
+from app.services.scratch import job_scratch_dir, remove_dir_atomically
+from app.services.watcher import InboxWatcher, LocalQueueSource, S3PollingSource
+
+
+class ListSource:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.acked = []
+
+    def poll(self):
+        return self.batches.pop(0) if self.batches else []
+
+    def ack(self, pdf_file):
+        self.acked.append(pdf_file)
+
+
+def write_event(queue_dir, name, keys, event_name="ObjectCreated:Put"):
+    message = {"Records": [{"eventName": event_name, "s3": {"object": {"key": key}}} for key in keys]}
+    with open(os.path.join(queue_dir, name), "w") as file:
+        json.dump(message, file)
+
+
+def test_s3_polling_source_reports_files_until_acknowledged(s3_file_handler):
+    s3_file_handler.files["a.pdf"] = 1
+    source = S3PollingSource(s3_file_handler, "bucket", "raw_files")
+    assert source.poll() == ["a.pdf"]
+    assert source.poll() == ["a.pdf"]
+    source.ack("a.pdf")
+    assert source.poll() == []
+    s3_file_handler.files["b.pdf"] = 2
+    assert source.poll() == ["b.pdf"]
+
+
+def test_local_queue_source_parses_and_consumes_notifications(tmp_path):
+    queue_dir = str(tmp_path / "events")
+    source = LocalQueueSource(queue_dir, "raw_files")
+    write_event(queue_dir, "1.json", ["raw_files/My+Paper%281%29.pdf", "raw_files/notes.txt", "other/c.pdf"])
+    write_event(queue_dir, "2.json", ["raw_files/deleted.pdf"], event_name="ObjectRemoved:Delete")
+    with open(os.path.join(queue_dir, "3.json"), "w") as file:
+        file.write("not json")
+
+    assert source.poll() == ["My Paper(1).pdf"]
+    # Only the message with work left is kept; the unreadable one is set aside
+    assert sorted(os.listdir(queue_dir)) == ["1.json", "3.json.invalid"]
+
+    # Not acknowledged yet, e.g. the job failed or the daemon restarted
+    assert LocalQueueSource(queue_dir, "raw_files").poll() == ["My Paper(1).pdf"]
+
+    source.ack("My Paper(1).pdf")
+    assert source.poll() == []
+    assert os.listdir(queue_dir) == ["3.json.invalid"]
+
+
+def test_job_scratch_dirs_are_isolated_and_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SCRATCH_DIR", str(tmp_path))
+    with job_scratch_dir("paper") as first, job_scratch_dir("paper") as second:
+        assert first != second
+        # A file in one job's directory with a shared prefix is never touched by the other job
+        open(os.path.join(first, "paper.pdf"), "w").close()
+        open(os.path.join(second, "paper_v2.pdf"), "w").close()
+        remove_dir_atomically(second)
+        assert os.path.exists(os.path.join(first, "paper.pdf"))
+    assert not os.path.exists(first)
+    assert os.listdir(tmp_path) == []
+
+
+def test_job_scratch_dir_is_removed_on_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SCRATCH_DIR", str(tmp_path))
+    try:
+        with job_scratch_dir("paper") as path:
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert not os.path.exists(path)
+
+
+def test_watcher_dispatches_new_files_to_workers():
+    processed = []
+    lock = threading.Lock()
+
+    def process(pdf_file):
+        if pdf_file == "bad.pdf":
+            raise RuntimeError("boom")
+        with lock:
+            processed.append(pdf_file)
+
+    source = ListSource([["a.pdf", "bad.pdf"], [], ["b.pdf"]])
+    watcher = InboxWatcher(source, process, poll_interval=0.01, workers=2, max_attempts=3)
+    watcher.run(max_polls=3)
+
+    assert sorted(processed) == ["a.pdf", "b.pdf"]
+    assert sorted(source.acked) == ["a.pdf", "b.pdf"]
+    assert watcher.attempts == {"bad.pdf": 1}
+    assert watcher.in_flight == {}
+
+
+def test_jobs_finish_while_the_source_is_polled():
+    started = threading.Event()
+    second_poll = threading.Event()
+    acked = threading.Event()
+    calls = []
+
+    class SlowSource(ListSource):
+        polls = 0
+        ack_seen_during_poll = False
+
+        def poll(self):
+            self.polls += 1
+            if self.polls == 2:
+                started.wait(timeout=2)
+                second_poll.set()
+                # Stands in for a slow S3 listing taken before the ack
+                self.ack_seen_during_poll = acked.wait(timeout=2)
+                return ["a.pdf"]
+            return super().poll()
+
+        def ack(self, pdf_file):
+            super().ack(pdf_file)
+            acked.set()
+
+    def process(pdf_file):
+        calls.append(pdf_file)
+        started.set()
+        second_poll.wait(timeout=2)
+
+    source = SlowSource([["a.pdf"]])
+    watcher = InboxWatcher(source, process, poll_interval=0.01, workers=1)
+    watcher.run(max_polls=3)
+
+    assert source.ack_seen_during_poll
+    # The stale listing does not start the finished job again
+    assert calls == ["a.pdf"]
+    assert source.acked == ["a.pdf"]
+
+
+def test_watcher_retries_failed_files_then_gives_up(s3_file_handler):
+    s3_file_handler.files = {"flaky.pdf": 1, "broken.pdf": 1}
+    calls = []
+
+    def process(pdf_file):
+        calls.append(pdf_file)
+        if pdf_file == "broken.pdf" or calls.count(pdf_file) == 1:
+            raise RuntimeError("throttled")
+
+    source = S3PollingSource(s3_file_handler, "bucket", "raw_files")
+    watcher = InboxWatcher(source, process, poll_interval=0.01, workers=1, max_attempts=3)
+    for _ in range(4):
+        watcher.run(max_polls=1)
+
+    assert calls.count("flaky.pdf") == 2
+    assert calls.count("broken.pdf") == 3
+    assert source.poll() == []
+
+
+def test_watcher_stops_when_asked():
+    source = ListSource([])
+    watcher = InboxWatcher(source, lambda pdf_file: None, poll_interval=60, workers=1)
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    watcher.stop()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+from datetime import datetime
+
+import pytest
+
+from app.db.models.base import Base, configure_engine, session_scope
+from app.db.models.paper_jobs import PaperJob
+from app.services.worker import Worker
+
+
+def expire_leases():
+    with session_scope() as session:
+        session.query(PaperJob).update({PaperJob.lease_expires_at: datetime(2000, 1, 1)})
+
+
+def test_enqueue_is_idempotent(sqlite_engine):
+    assert PaperJob.enqueue(["a.pdf", "b.pdf"]) == ["a.pdf", "b.pdf"]
+    assert PaperJob.enqueue(["a.pdf", "c.pdf"]) == ["c.pdf"]
+    assert PaperJob.count_by_status() == {PaperJob.STATUS_PENDING: 3}
+
+
+def test_expired_lease_is_reclaimed(sqlite_engine):
+    PaperJob.enqueue(["a.pdf"])
+    job = PaperJob.claim("worker-1", lease_seconds=60)
+    assert PaperJob.claim("worker-2", lease_seconds=60) is None
+
+    # worker-1 crashes and its lease runs out
+    expire_leases()
+
+    reclaimed = PaperJob.claim("worker-2", lease_seconds=60)
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 2
+    assert not PaperJob.heartbeat(job.id, "worker-1", lease_seconds=60)
+    assert not PaperJob.complete(job.id, "worker-1")
+    assert PaperJob.complete(job.id, "worker-2")
+
+
+def test_job_that_keeps_killing_its_worker_is_failed_on_reclaim(sqlite_engine):
+    PaperJob.enqueue(["oom.pdf"])
+    for attempt in range(2):
+        assert PaperJob.claim(f"worker-{attempt}", lease_seconds=60, max_attempts=2) is not None
+        expire_leases()
+
+    assert PaperJob.claim("worker-2", lease_seconds=60, max_attempts=2) is None
+    assert PaperJob.count_by_status() == {PaperJob.STATUS_FAILED: 1}
+
+
+def test_worker_retries_then_fails(sqlite_engine):
+    PaperJob.enqueue(["ok.pdf", "broken.pdf"])
+    processed = []
+
+    def process(object_key):
+        if object_key == "broken.pdf":
+            raise RuntimeError("boom")
+        processed.append(object_key)
+
+    Worker(process, worker_id="worker-1", lease_seconds=60, heartbeat_interval=1, max_attempts=2).run(exit_when_idle=True)
+
+    assert processed == ["ok.pdf"]
+    assert PaperJob.count_by_status() == {PaperJob.STATUS_DONE: 1, PaperJob.STATUS_FAILED: 1}
+
+
+def _run_worker(database_url, processed):
+    configure_engine(database_url)
+    Worker(processed.append, lease_seconds=60, heartbeat_interval=1).run(exit_when_idle=True)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("TEST_POSTGRES_URL"),
+    reason="set TEST_POSTGRES_URL to a local Postgres to test concurrent workers",
+)
+def test_concurrent_workers_claim_each_job_once():
+    database_url = os.environ["TEST_POSTGRES_URL"]
+    engine = configure_engine(database_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    object_keys = [f"paper_{i}.pdf" for i in range(50)]
+    PaperJob.enqueue(object_keys)
+    engine.dispose()
+
+    with multiprocessing.Manager() as manager:
+        processed = manager.list()
+        workers = [multiprocessing.Process(target=_run_worker, args=(database_url, processed)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert sorted(processed) == sorted(object_keys)
+
+    assert PaperJob.count_by_status() == {PaperJob.STATUS_DONE: len(object_keys)}